@@ -1,4 +1,4 @@
-# Cifra y descifra una imagen con AES (CTR) usando pyaes.
+# Cifra y descifra una imagen con AES (CTR) usando pyaes o el motor NumPy (aes_numpy.py).
 # Requisitos del taller:
 # - Recibe una imagen (cualquier formato).
 # - Cifra con AES y nivel 128/192/256 bits como parámetro CLI.
@@ -6,16 +6,46 @@
 # - Decodifica Base64, descifra, genera imagen original y la muestra.
 
 import argparse
-import base64
+import glob
+import hashlib
+import hmac
 import os
 import sys
-from typing import Tuple
-
-import matplotlib.pyplot as plt
-from skimage import io
+import tempfile
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from io import SEEK_CUR, SEEK_END, SEEK_SET, BytesIO, RawIOBase
+from typing import BinaryIO, List, Optional, Tuple, Union
 
 import pyaes  # pip install pyaes
 
+# Permite importar los módulos compartidos de la carpeta raíz del repositorio (comun/).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun import b64stream, cbc_parallel, key_cache, mmap_io, preview, stream_io  # noqa: E402
+
+# Tamaño de bloque que se lee/escribe en el modo streaming. Debe ser múltiplo
+# de 16 (bloque AES) para que el contador CTR avance siempre por bloques completos.
+CHUNK_SIZE = 1 << 20  # 1 MiB
+NONCE_SIZE = 8
+
+# Extensión que se añade a los archivos cifrados en modo lote.
+BATCH_SUFFIX = ".aes"
+
+# Contenedor autenticado (CTR + HMAC-SHA256 por bloque):
+#   [MAGIC(4)][NONCE(8)][CHUNK_SIZE(4)] + por cada bloque: [CIPHERTEXT(<= CHUNK_SIZE)][TAG(32)]
+AUTH_MAGIC = b"AESA"
+AUTH_HEADER_SIZE = len(AUTH_MAGIC) + NONCE_SIZE + 4
+TAG_SIZE = 32
+
+# Modos de operación del CLI. CBC guarda [IV(16)][CIPHERTEXT con relleno PKCS7].
+MODES = ("ctr", "cbc")
+BLOCK_SIZE = 16
+
+# Motores disponibles para el bloque AES: pyaes (Python puro) o NumPy (T-tables).
+ENGINES = ("pyaes", "numpy")
+
 
 def read_file_bytes(path: str) -> bytes:
     with open(path, "rb") as f:
@@ -32,7 +62,64 @@ def split_ext(path: str) -> Tuple[str, str]:
     return name, ext.lstrip(".")
 
 
-def encrypt_aes_ctr(key: bytes, plaintext: bytes) -> bytes:
+def _pyaes_ctr(aes: pyaes.AES, counter: int, data: bytes) -> bytes:
+    """
+    CTR sobre un objeto pyaes.AES ya expandido (el mismo keystream que genera
+    pyaes.AESModeOfOperationCTR, pero sin volver a calcular las subclaves).
+    """
+    n = len(data)
+    if n == 0:
+        return b""
+    keystream = bytearray()
+    for i in range((n + 15) // 16):
+        block = ((counter + i) % (1 << 128)).to_bytes(16, "big")
+        keystream += bytes(aes.encrypt(list(block)))
+    mixed = int.from_bytes(data, "big") ^ int.from_bytes(keystream[:n], "big")
+    return mixed.to_bytes(n, "big")
+
+
+def _numpy_round_keys(key: bytes):
+    """
+    Subclaves para el motor NumPy. aes_numpy (y con él numpy) se importa solo
+    cuando se usa ese motor, para no pagar su carga en el camino con pyaes.
+    """
+    import aes_numpy
+
+    return aes_numpy, key_cache.get_schedule("aes-numpy", key, aes_numpy.expand_key)
+
+
+def ctr_xor(key: bytes, initial_value: int, block_offset: int, data: bytes,
+            engine: str = "pyaes") -> bytes:
+    """
+    Cifra/descifra `data` en CTR. El contador arranca en `initial_value + block_offset`,
+    es decir, exactamente donde lo dejaría el cifrado secuencial al llegar a ese
+    bloque (contador de 128 bits con desborde).
+    Las subclaves se toman de la caché compartida (comun/key_cache.py).
+    """
+    if engine == "numpy":
+        aes_numpy, round_keys = _numpy_round_keys(key)
+        return aes_numpy.ctr_xor(round_keys, initial_value, block_offset, data)
+    if engine != "pyaes":
+        raise ValueError(f"Motor AES desconocido: {engine}")
+    aes = key_cache.get_schedule("aes-pyaes", key, pyaes.AES)
+    return _pyaes_ctr(aes, initial_value + block_offset, data)
+
+
+def ctr_xor_into(key: bytes, initial_value: int, block_offset: int, data, out,
+                 engine: str = "pyaes") -> None:
+    """
+    Como `ctr_xor`, pero escribe el resultado directamente en el buffer `out`
+    (p. ej. un memoryview de un archivo mapeado). Con el motor NumPy no se crea
+    ninguna copia intermedia del tamaño de `data`.
+    """
+    if engine == "numpy":
+        aes_numpy, round_keys = _numpy_round_keys(key)
+        aes_numpy.ctr_xor_into(round_keys, initial_value, block_offset, data, out)
+    else:
+        out[:] = ctr_xor(key, initial_value, block_offset, data, engine)
+
+
+def encrypt_aes_ctr(key: bytes, plaintext: bytes, engine: str = "pyaes") -> bytes:
     """
     Para poder descifrar correctamente en otra instancia, incluimos un 'nonce'
     de 8 bytes al inicio del mensaje (antes del ciphertext). El contador CTR se
@@ -41,13 +128,11 @@ def encrypt_aes_ctr(key: bytes, plaintext: bytes) -> bytes:
     """
     nonce = os.urandom(8)
     initial_value = int.from_bytes(nonce, "big")
-    ctr = pyaes.Counter(initial_value)
-    aes = pyaes.AESModeOfOperationCTR(key, ctr)
-    ciphertext = aes.encrypt(plaintext)
+    ciphertext = ctr_xor(key, initial_value, 0, plaintext, engine)
     return nonce + ciphertext
 
 
-def decrypt_aes_ctr(key: bytes, msg: bytes) -> bytes:
+def decrypt_aes_ctr(key: bytes, msg: bytes, engine: str = "pyaes") -> bytes:
     """
     Espera el formato [NONCE(8)][CIPHERTEXT].
     """
@@ -56,17 +141,550 @@ def decrypt_aes_ctr(key: bytes, msg: bytes) -> bytes:
     nonce = msg[:8]
     ciphertext = msg[8:]
     initial_value = int.from_bytes(nonce, "big")
-    ctr = pyaes.Counter(initial_value)
-    aes = pyaes.AESModeOfOperationCTR(key, ctr)
-    return aes.decrypt(ciphertext)
+    return ctr_xor(key, initial_value, 0, ciphertext, engine)
+
+
+def _ctr_segment(task: Tuple[bytes, int, int, bytes, str]) -> bytes:
+    """
+    Cifra/descifra un segmento en CTR dentro de un proceso del pool.
+    Debe ser una función de módulo para poder enviarse a otro proceso.
+    """
+    return ctr_xor(*task)
+
+
+def _split_segments(length: int, parts: int) -> List[Tuple[int, int]]:
+    """Divide [0, length) en `parts` tramos alineados a bloques de 16 bytes."""
+    nblocks = (length + 15) // 16
+    per_part = max(1, -(-nblocks // parts)) * 16
+    return [(start, min(start + per_part, length)) for start in range(0, length, per_part)]
+
+
+def ctr_transform_parallel(key: bytes, initial_value: int, data: bytes, pool: Executor,
+                           workers: int, block_offset: int = 0, engine: str = "pyaes") -> bytes:
+    """
+    Aplica CTR a `data` repartiéndolo en `workers` segmentos que se procesan en
+    `pool`. Cada segmento calcula su propio contador a partir del nonce, por lo
+    que el resultado es idéntico byte a byte al de un único AESModeOfOperationCTR.
+    """
+    tasks = [
+        (key, initial_value, block_offset + start // 16, data[start:end], engine)
+        for start, end in _split_segments(len(data), workers)
+    ]
+    return b"".join(pool.map(_ctr_segment, tasks))
+
+
+def encrypt_aes_ctr_parallel(key: bytes, plaintext: bytes, workers: int, engine: str = "pyaes") -> bytes:
+    """Como `encrypt_aes_ctr`, pero usando `workers` procesos."""
+    nonce = os.urandom(NONCE_SIZE)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return nonce + ctr_transform_parallel(key, int.from_bytes(nonce, "big"), plaintext, pool, workers,
+                                              engine=engine)
+
+
+def decrypt_aes_ctr_parallel(key: bytes, msg: bytes, workers: int, engine: str = "pyaes") -> bytes:
+    """Como `decrypt_aes_ctr`, pero usando `workers` procesos."""
+    if len(msg) < NONCE_SIZE:
+        raise ValueError("Mensaje inválido: no contiene NONCE.")
+    initial_value = int.from_bytes(msg[:NONCE_SIZE], "big")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return ctr_transform_parallel(key, initial_value, msg[NONCE_SIZE:], pool, workers, engine=engine)
+
+
+def _ctr_transform_stream(key: bytes, initial_value: int, src: BinaryIO, dst: BinaryIO,
+                          chunk_size: int, workers: int = 1, engine: str = "pyaes") -> int:
+    """
+    Aplica el keystream CTR a `src` por bloques de `chunk_size` bytes y escribe
+    cada bloque en `dst`. El contador continúa donde quedó el bloque anterior.
+    Con `workers > 1` cada bloque se reparte entre un pool de procesos.
+    Devuelve el número de bytes procesados.
+    """
+    stream_io.check_chunk_size(chunk_size, BLOCK_SIZE)
+    pool: Optional[Executor] = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    total = 0
+    try:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            if pool is None:
+                dst.write(ctr_xor(key, initial_value, total // 16, chunk, engine))
+            else:
+                dst.write(ctr_transform_parallel(key, initial_value, chunk, pool, workers, total // 16, engine))
+            total += len(chunk)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return total
+
+
+def encrypt_aes_ctr_stream(key: bytes, src: BinaryIO, dst: BinaryIO, chunk_size: int = CHUNK_SIZE,
+                           workers: int = 1, engine: str = "pyaes") -> int:
+    """
+    Versión streaming de `encrypt_aes_ctr`: lee `src` por bloques y escribe en
+    `dst` el mismo formato [NONCE(8)][CIPHERTEXT]. La memoria usada es O(chunk_size)
+    sin importar el tamaño del archivo. Devuelve los bytes escritos en `dst`.
+    """
+    nonce = os.urandom(NONCE_SIZE)
+    dst.write(nonce)
+    n = _ctr_transform_stream(key, int.from_bytes(nonce, "big"), src, dst, chunk_size, workers, engine)
+    return NONCE_SIZE + n
+
+
+def decrypt_aes_ctr_stream(key: bytes, src: BinaryIO, dst: BinaryIO, chunk_size: int = CHUNK_SIZE,
+                           workers: int = 1, engine: str = "pyaes") -> int:
+    """
+    Versión streaming de `decrypt_aes_ctr`. Espera el formato [NONCE(8)][CIPHERTEXT]
+    en `src`. Devuelve los bytes de texto plano escritos en `dst`.
+    """
+    nonce = src.read(NONCE_SIZE)
+    if len(nonce) < NONCE_SIZE:
+        raise ValueError("Mensaje inválido: no contiene NONCE.")
+    return _ctr_transform_stream(key, int.from_bytes(nonce, "big"), src, dst, chunk_size, workers, engine)
+
+
+def encrypt_file(key: bytes, in_path: str, out_path: str, chunk_size: int = CHUNK_SIZE,
+                 workers: int = 1, engine: str = "pyaes") -> int:
+    with open(in_path, "rb") as src, open(out_path, "wb") as dst:
+        return encrypt_aes_ctr_stream(key, src, dst, chunk_size, workers, engine)
+
+
+def decrypt_file(key: bytes, in_path: str, out_path: str, chunk_size: int = CHUNK_SIZE,
+                 workers: int = 1, engine: str = "pyaes") -> int:
+    with open(in_path, "rb") as src, open(out_path, "wb") as dst:
+        return decrypt_aes_ctr_stream(key, src, dst, chunk_size, workers, engine)
+
+
+def _ctr_mmap_segment(task: Tuple[bytes, int, str, int, str, int, int, int, int, str]) -> int:
+    """
+    Procesa el tramo [start, end) del payload: mapea el origen (solo lectura) y el
+    destino (ya dimensionado) y escribe en su lugar, de `chunk_size` en `chunk_size`.
+    Se usa tanto en el proceso principal como en los workers del pool.
+    """
+    key, initial_value, in_path, in_offset, out_path, out_offset, start, end, chunk_size, engine = task
+    with mmap_io.map_input(in_path) as src, mmap_io.map_existing(out_path) as dst:
+        for pos in range(start, end, chunk_size):
+            stop = min(pos + chunk_size, end)
+            with src[in_offset + pos:in_offset + stop] as piece, \
+                    dst[out_offset + pos:out_offset + stop] as target:
+                ctr_xor_into(key, initial_value, pos // 16, piece, target, engine)
+    return end - start
+
+
+def _ctr_transform_mmap(key: bytes, initial_value: int, in_path: str, in_offset: int,
+                        out_path: str, out_offset: int, length: int, chunk_size: int,
+                        workers: int, engine: str) -> None:
+    stream_io.check_chunk_size(chunk_size, BLOCK_SIZE)
+    tasks = [
+        (key, initial_value, in_path, in_offset, out_path, out_offset, start, end, chunk_size, engine)
+        for start, end in _split_segments(length, workers)
+    ]
+    if workers > 1 and len(tasks) > 1:
+        # Cada worker mapea los archivos por su cuenta: no se envían datos entre procesos.
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_ctr_mmap_segment, tasks))
+    else:
+        for task in tasks:
+            _ctr_mmap_segment(task)
+
+
+def encrypt_file_mmap(key: bytes, in_path: str, out_path: str, chunk_size: int = CHUNK_SIZE,
+                      workers: int = 1, engine: str = "pyaes") -> int:
+    """
+    Cifra `in_path` en `out_path` ([NONCE(8)][CIPHERTEXT]) con mmap: el origen se
+    mapea en solo lectura y el destino se crea con su tamaño final y se escribe
+    en su lugar. Devuelve el tamaño del archivo cifrado.
+    """
+    length = os.path.getsize(in_path)
+    nonce = os.urandom(NONCE_SIZE)
+    with mmap_io.map_output(out_path, NONCE_SIZE + length) as dst:
+        dst[:NONCE_SIZE] = nonce
+    _ctr_transform_mmap(key, int.from_bytes(nonce, "big"), in_path, 0, out_path, NONCE_SIZE,
+                        length, chunk_size, workers, engine)
+    return NONCE_SIZE + length
+
+
+def decrypt_file_mmap(key: bytes, in_path: str, out_path: str, chunk_size: int = CHUNK_SIZE,
+                      workers: int = 1, engine: str = "pyaes") -> int:
+    """Descifra con mmap un archivo [NONCE(8)][CIPHERTEXT]. Devuelve el tamaño del texto plano."""
+    total = os.path.getsize(in_path)
+    if total < NONCE_SIZE:
+        raise ValueError("Mensaje inválido: no contiene NONCE.")
+    with open(in_path, "rb") as f:
+        nonce = f.read(NONCE_SIZE)
+    length = total - NONCE_SIZE
+    with open(out_path, "wb") as f:
+        f.truncate(length)
+    _ctr_transform_mmap(key, int.from_bytes(nonce, "big"), in_path, NONCE_SIZE, out_path, 0,
+                        length, chunk_size, workers, engine)
+    return length
+
+
+class AESCTRReader(RawIOBase):
+    """
+    Lector de acceso aleatorio sobre un archivo [NONCE(8)][CIPHERTEXT].
+    En CTR el keystream del bloque i depende solo de nonce + i, así que cualquier
+    rango se descifra leyendo y procesando únicamente ese rango: O(rango), no O(archivo).
+
+        with AESCTRReader(key, "foto.bin") as f:
+            f.seek(1000)
+            parte = f.read(64)          # interfaz de archivo
+            otra = f.pread(5000, 128)   # lectura posicional, no mueve el cursor
+    """
+
+    def __init__(self, key: bytes, source: Union[str, BinaryIO], engine: str = "pyaes"):
+        super().__init__()
+        self._owns_file = isinstance(source, str)
+        self._file = open(source, "rb") if self._owns_file else source
+        self._file.seek(0, SEEK_END)
+        total = self._file.tell()
+        if total < NONCE_SIZE:
+            self.close()
+            raise ValueError("Mensaje inválido: no contiene NONCE.")
+        self._file.seek(0)
+        self._initial_value = int.from_bytes(self._file.read(NONCE_SIZE), "big")
+        self._key = key
+        self._engine = engine
+        self._pos = 0
+        self.size = total - NONCE_SIZE
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        base = {SEEK_SET: 0, SEEK_CUR: self._pos, SEEK_END: self.size}[whence]
+        if base + offset < 0:
+            raise ValueError("Posición negativa.")
+        self._pos = base + offset
+        return self._pos
+
+    def pread(self, offset: int, length: int) -> bytes:
+        """Descifra `length` bytes a partir de `offset` (en el texto plano)."""
+        if offset < 0 or length < 0:
+            raise ValueError("offset y length deben ser no negativos.")
+        length = min(length, self.size - offset)
+        if length <= 0:
+            return b""
+        block, skip = divmod(offset, 16)
+        self._file.seek(NONCE_SIZE + offset)
+        ciphertext = self._file.read(length)
+        # Se antepone relleno hasta el inicio del bloque para alinear el keystream.
+        plain = ctr_xor(self._key, self._initial_value, block, bytes(skip) + ciphertext, self._engine)
+        return plain[skip:]
+
+    def readinto(self, b) -> int:
+        data = self.pread(self._pos, len(b))
+        n = len(data)
+        b[:n] = data
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        if self._owns_file and not self._file.closed:
+            self._file.close()
+        super().close()
+
+
+class AuthenticationError(ValueError):
+    """El cifrado autenticado fue modificado, truncado o la clave no es la correcta."""
+
+
+def _derive_auth_keys(key: bytes) -> Tuple[bytes, bytes]:
+    """Claves independientes para AES-CTR y para HMAC, derivadas de la clave del usuario."""
+    enc_key = hmac.new(key, b"AES-CTR-HMAC enc", hashlib.sha256).digest()[:len(key)]
+    mac_key = hmac.new(key, b"AES-CTR-HMAC mac", hashlib.sha256).digest()
+    return enc_key, mac_key
+
+
+def _chunk_tag(header_mac: "hmac.HMAC", index: int, final: bool, ciphertext: bytes) -> bytes:
+    """
+    Etiqueta del bloque `index`. Cubre la cabecera, la posición del bloque y si es
+    el último, así se detectan bloques reordenados, eliminados o un archivo truncado.
+    """
+    mac = header_mac.copy()
+    mac.update(index.to_bytes(8, "big") + (b"\x01" if final else b"\x00"))
+    mac.update(ciphertext)
+    return mac.digest()
+
+
+def encrypt_aes_ctr_auth_stream(key: bytes, src: BinaryIO, dst: BinaryIO, chunk_size: int = CHUNK_SIZE,
+                                engine: str = "pyaes") -> int:
+    """
+    Cifrado autenticado en streaming: cada bloque se cifra en CTR y su etiqueta
+    HMAC-SHA256 se calcula sobre el cifrado recién producido, sin segunda pasada.
+    Devuelve los bytes escritos en `dst`.
+    """
+    stream_io.check_chunk_size(chunk_size, BLOCK_SIZE)
+    enc_key, mac_key = _derive_auth_keys(key)
+    nonce = os.urandom(NONCE_SIZE)
+    header = AUTH_MAGIC + nonce + chunk_size.to_bytes(4, "big")
+    header_mac = hmac.new(mac_key, header, hashlib.sha256)
+    initial_value = int.from_bytes(nonce, "big")
+    dst.write(header)
+    written = len(header)
+
+    chunk = stream_io.read_exact(src, chunk_size)
+    index = 0
+    while True:
+        # Se lee el siguiente bloque por adelantado para saber si este es el último.
+        following = stream_io.read_exact(src, chunk_size) if len(chunk) == chunk_size else b""
+        final = not following
+        ciphertext = ctr_xor(enc_key, initial_value, index * (chunk_size // 16), chunk, engine)
+        dst.write(ciphertext)
+        dst.write(_chunk_tag(header_mac, index, final, ciphertext))
+        written += len(ciphertext) + TAG_SIZE
+        if final:
+            return written
+        chunk = following
+        index += 1
+
+
+def decrypt_aes_ctr_auth_stream(key: bytes, src: BinaryIO, dst: BinaryIO, engine: str = "pyaes") -> int:
+    """
+    Descifra el contenedor autenticado. Cada bloque se verifica antes de descifrarlo
+    y escribirlo: si una etiqueta no coincide se lanza AuthenticationError y ese
+    bloque (ni ninguno posterior) llega a `dst`. Devuelve los bytes escritos.
+    """
+    header = stream_io.read_exact(src, AUTH_HEADER_SIZE)
+    if len(header) < AUTH_HEADER_SIZE or not header.startswith(AUTH_MAGIC):
+        raise ValueError("Mensaje inválido: no es un contenedor AES autenticado.")
+    nonce = header[len(AUTH_MAGIC):len(AUTH_MAGIC) + NONCE_SIZE]
+    chunk_size = int.from_bytes(header[-4:], "big")
+    if chunk_size <= 0 or chunk_size % 16 != 0:
+        raise ValueError("Mensaje inválido: tamaño de bloque incorrecto.")
+    enc_key, mac_key = _derive_auth_keys(key)
+    header_mac = hmac.new(mac_key, header, hashlib.sha256)
+    initial_value = int.from_bytes(nonce, "big")
+
+    record_size = chunk_size + TAG_SIZE
+    record = stream_io.read_exact(src, record_size)
+    index = 0
+    written = 0
+    while True:
+        if len(record) < TAG_SIZE:
+            raise AuthenticationError("Cifrado truncado: falta la etiqueta de autenticación.")
+        following = stream_io.read_exact(src, record_size) if len(record) == record_size else b""
+        final = not following
+        ciphertext, tag = record[:-TAG_SIZE], record[-TAG_SIZE:]
+        if not hmac.compare_digest(tag, _chunk_tag(header_mac, index, final, ciphertext)):
+            raise AuthenticationError(
+                f"Falló la verificación del bloque {index}: datos alterados o clave incorrecta."
+            )
+        plain = ctr_xor(enc_key, initial_value, index * (chunk_size // 16), ciphertext, engine)
+        dst.write(plain)
+        written += len(plain)
+        if final:
+            return written
+        record = following
+        index += 1
+
+
+def encrypt_file_auth(key: bytes, in_path: str, out_path: str, chunk_size: int = CHUNK_SIZE,
+                      engine: str = "pyaes") -> int:
+    with open(in_path, "rb") as src, open(out_path, "wb") as dst:
+        return encrypt_aes_ctr_auth_stream(key, src, dst, chunk_size, engine)
+
+
+def decrypt_file_auth(key: bytes, in_path: str, out_path: str, engine: str = "pyaes") -> int:
+    """Descifra el contenedor autenticado; `out_path` solo aparece si todo el archivo se verificó."""
+    with open(in_path, "rb") as src, stream_io.replace_on_success(out_path) as dst:
+        return decrypt_aes_ctr_auth_stream(key, src, dst, engine)
+
+
+def _aes_ecb_decrypt(key: bytes, engine: str, data: bytes) -> bytes:
+    """
+    Descifra cada bloque de 16 bytes de `data` sin encadenar (paso D() de CBC).
+    Es una función de módulo para poder usarse desde los workers del pool.
+    """
+    if engine == "numpy":
+        import aes_numpy
+
+        dec_keys = key_cache.get_schedule(
+            "aes-numpy-dec", key, lambda k: aes_numpy.decryption_keys(aes_numpy.expand_key(k))
+        )
+        return aes_numpy.ecb_decrypt(dec_keys, data)
+    aes = key_cache.get_schedule("aes-pyaes", key, pyaes.AES)
+    out = bytearray(len(data))
+    for pos in range(0, len(data), BLOCK_SIZE):
+        out[pos:pos + BLOCK_SIZE] = bytes(aes.decrypt(list(data[pos:pos + BLOCK_SIZE])))
+    return bytes(out)
+
+
+def _aes_cbc_encrypt_blocks(aes: pyaes.AES, iv: bytes, data: bytes) -> bytes:
+    """CBC al cifrar es secuencial: cada bloque se mezcla con el cifrado anterior."""
+    out = bytearray(len(data))
+    prev = int.from_bytes(iv, "big")
+    for pos in range(0, len(data), BLOCK_SIZE):
+        block = (int.from_bytes(data[pos:pos + BLOCK_SIZE], "big") ^ prev).to_bytes(BLOCK_SIZE, "big")
+        encrypted = bytes(aes.encrypt(list(block)))
+        out[pos:pos + BLOCK_SIZE] = encrypted
+        prev = int.from_bytes(encrypted, "big")
+    return bytes(out)
+
+
+def encrypt_aes_cbc_stream(key: bytes, src: BinaryIO, dst: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Cifra en CBC por bloques de `chunk_size` y escribe [IV(16)][CIPHERTEXT].
+    El cifrado CBC no se puede paralelizar, así que siempre usa el bloque de pyaes
+    (con subclaves de la caché). Devuelve los bytes escritos.
+    """
+    stream_io.check_chunk_size(chunk_size, BLOCK_SIZE)
+    aes = key_cache.get_schedule("aes-pyaes", key, pyaes.AES)
+    prev = os.urandom(BLOCK_SIZE)
+    dst.write(prev)
+    written = BLOCK_SIZE
+    chunk = stream_io.read_exact(src, chunk_size)
+    while True:
+        following = stream_io.read_exact(src, chunk_size) if len(chunk) == chunk_size else b""
+        if not following:
+            n = BLOCK_SIZE - len(chunk) % BLOCK_SIZE
+            chunk += bytes([n]) * n
+        ciphertext = _aes_cbc_encrypt_blocks(aes, prev, chunk)
+        dst.write(ciphertext)
+        written += len(ciphertext)
+        if not following:
+            return written
+        prev = ciphertext[-BLOCK_SIZE:]
+        chunk = following
+
+
+def decrypt_aes_cbc_stream(key: bytes, src: BinaryIO, dst: BinaryIO, chunk_size: int = CHUNK_SIZE,
+                           workers: int = 1, engine: str = "pyaes") -> int:
+    """
+    Descifra [IV(16)][CIPHERTEXT] en CBC. Cada bloque de `chunk_size` se reparte
+    entre `workers` procesos (comun/cbc_parallel.py); el resultado es el mismo que
+    el descifrado secuencial. Devuelve los bytes de texto plano escritos.
+    """
+    stream_io.check_chunk_size(chunk_size, BLOCK_SIZE)
+    prev = stream_io.read_exact(src, BLOCK_SIZE)
+    chunk = stream_io.read_exact(src, chunk_size)
+    if len(prev) < BLOCK_SIZE or not chunk:
+        raise ValueError("Mensaje inválido: no contiene IV y al menos un bloque.")
+    ecb_decrypt = partial(_aes_ecb_decrypt, key, engine)
+    pool: Optional[Executor] = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    written = 0
+    try:
+        while True:
+            following = stream_io.read_exact(src, chunk_size) if len(chunk) == chunk_size else b""
+            plain = cbc_parallel.cbc_decrypt(ecb_decrypt, prev, chunk, workers, pool)
+            if not following:
+                plain = stream_io.pkcs_unpad(plain, BLOCK_SIZE)
+            dst.write(plain)
+            written += len(plain)
+            if not following:
+                return written
+            prev = chunk[-BLOCK_SIZE:]
+            chunk = following
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def encrypt_aes_cbc(key: bytes, plaintext: bytes) -> bytes:
+    """Cifra en CBC en memoria. Estructura: [IV(16)][CIPHERTEXT con PKCS7]."""
+    out = BytesIO()
+    encrypt_aes_cbc_stream(key, BytesIO(plaintext), out)
+    return out.getvalue()
+
+
+def decrypt_aes_cbc(key: bytes, msg: bytes, workers: int = 1, engine: str = "pyaes") -> bytes:
+    """Descifra en memoria un mensaje [IV(16)][CIPHERTEXT], en paralelo si workers > 1."""
+    if len(msg) < 2 * BLOCK_SIZE or len(msg) % BLOCK_SIZE != 0:
+        raise ValueError("Mensaje inválido: no contiene IV y al menos un bloque.")
+    plain = cbc_parallel.cbc_decrypt(partial(_aes_ecb_decrypt, key, engine), msg[:BLOCK_SIZE],
+                                     msg[BLOCK_SIZE:], workers)
+    return stream_io.pkcs_unpad(plain, BLOCK_SIZE)
+
+
+def encrypt_file_cbc(key: bytes, in_path: str, out_path: str, chunk_size: int = CHUNK_SIZE) -> int:
+    with open(in_path, "rb") as src, open(out_path, "wb") as dst:
+        return encrypt_aes_cbc_stream(key, src, dst, chunk_size)
+
+
+def expand_batch_inputs(pattern: str) -> List[str]:
+    """
+    Archivos a cifrar en modo lote: si `pattern` es un directorio, sus archivos
+    (sin recorrer subdirectorios); si no, se interpreta como glob (admite **).
+    Se omiten los archivos que ya tienen la extensión BATCH_SUFFIX.
+    """
+    if os.path.isdir(pattern):
+        candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+    else:
+        candidates = glob.glob(pattern, recursive=True)
+    return sorted(
+        path for path in candidates
+        if os.path.isfile(path) and not path.endswith(BATCH_SUFFIX)
+    )
+
+
+def batch_output_paths(inputs: List[str], out_dir: Optional[str] = None) -> List[str]:
+    """
+    Ruta de salida para cada entrada: `<archivo>.aes` junto al original o dentro
+    de `out_dir`. Si dos entradas producirían el mismo nombre (o ya existe un
+    archivo con ese nombre), se añade un sufijo numérico: foto-1.png.aes, ...
+    """
+    taken = set()
+    outputs = []
+    for in_path in inputs:
+        folder = out_dir if out_dir is not None else os.path.dirname(in_path)
+        name, ext = os.path.splitext(os.path.basename(in_path))
+        candidate = os.path.join(folder, f"{name}{ext}{BATCH_SUFFIX}")
+        n = 0
+        while candidate in taken or os.path.exists(candidate):
+            n += 1
+            candidate = os.path.join(folder, f"{name}-{n}{ext}{BATCH_SUFFIX}")
+        taken.add(candidate)
+        outputs.append(candidate)
+    return outputs
+
+
+def _encrypt_batch_item(task: Tuple[bytes, str, str, int, str, bool]) -> int:
+    key, in_path, out_path, chunk_size, engine, use_mmap = task
+    if use_mmap:
+        encrypt_file_mmap(key, in_path, out_path, chunk_size, 1, engine)
+    else:
+        encrypt_file(key, in_path, out_path, chunk_size, 1, engine)
+    return os.path.getsize(in_path)
+
+
+def encrypt_batch(key: bytes, inputs: List[str], out_dir: Optional[str] = None, workers: int = 4,
+                  use_processes: Optional[bool] = None, chunk_size: int = CHUNK_SIZE, engine: str = "pyaes",
+                  use_mmap: bool = False) -> Tuple[List[str], int, float]:
+    """
+    Cifra cada archivo de `inputs` (cada uno con su propio nonce) usando un pool
+    acotado de hilos o procesos. Devuelve (rutas de salida, bytes cifrados, segundos).
+    Si no se indica `use_processes`, con pyaes se usan procesos (en Python puro los
+    hilos no cifran en paralelo por el GIL) y con el motor NumPy, hilos.
+    """
+    if use_processes is None:
+        use_processes = engine == "pyaes"
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    outputs = batch_output_paths(inputs, out_dir)
+    tasks = [(key, i, o, chunk_size, engine, use_mmap) for i, o in zip(inputs, outputs)]
+    pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    start = time.perf_counter()
+    with pool_class(max_workers=workers) as pool:
+        total = sum(pool.map(_encrypt_batch_item, tasks))
+    return outputs, total, time.perf_counter() - start
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Cifrar/descifrar una imagen con AES (CTR) y mostrar Base64."
     )
-    parser.add_argument(
-        "--input", "-i", required=True, help="Ruta a la imagen de entrada (jpg, png, etc.)"
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--input", "-i", help="Ruta a la imagen de entrada (jpg, png, etc.)"
+    )
+    source.add_argument(
+        "--batch",
+        help="Modo lote: directorio o glob (p. ej. 'fotos/**/*.png') con los archivos a cifrar.",
     )
     parser.add_argument(
         "--bits",
@@ -80,9 +698,69 @@ def parse_args() -> argparse.Namespace:
         "--keyhex",
         help="Clave en HEX opcional (32/48/64 hex-chars para 128/192/256 bits). Si no se provee, se genera aleatoria.",
     )
+    parser.add_argument(
+        "--enc-out",
+        default="encrypted_image.bin",
+        help="Ruta del archivo cifrado ([NONCE][CIPHERTEXT], o [IV][CIPHERTEXT] en CBC) "
+        "(por defecto: encrypted_image.bin).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help=f"Tamaño de bloque para cifrar en streaming, múltiplo de 16 (por defecto: {CHUNK_SIZE}).",
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="Número de procesos para cifrar/descifrar CTR en paralelo; en modo lote, "
+        "número de archivos simultáneos (por defecto: 1).",
+    )
+    parser.add_argument(
+        "--engine",
+        "-e",
+        choices=ENGINES,
+        default="pyaes",
+        help="Motor AES: pyaes (Python puro) o numpy (T-tables vectorizadas, mucho más rápido).",
+    )
+    parser.add_argument(
+        "--mode",
+        "-m",
+        choices=MODES,
+        default="ctr",
+        help="Modo de operación: ctr (por defecto) o cbc (el descifrado CBC se reparte entre --workers).",
+    )
+    parser.add_argument(
+        "--auth",
+        action="store_true",
+        help="Cifrado autenticado: CTR + HMAC-SHA256 por bloque; el descifrado rechaza datos alterados.",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Cifrar con archivos mapeados en memoria (mmap), pensado para archivos muy grandes.",
+    )
+    parser.add_argument(
+        "--out-dir",
+        help="Modo lote: directorio donde guardar los .aes (por defecto, junto a cada archivo).",
+    )
+    parser.add_argument(
+        "--pool",
+        choices=["thread", "process"],
+        help="Modo lote: tipo de pool para repartir los archivos. Por defecto process con "
+             "--engine pyaes (Python puro, los hilos no avanzan en paralelo por el GIL) y "
+             "thread con --engine numpy.",
+    )
     parser.add_argument(
         "--save-b64",
-        help="(Opcional) Ruta de salida para guardar también el Base64 (txt).",
+        help="(Opcional) Ruta de salida para guardar también el Base64 (txt o tubería con nombre).",
+    )
+    parser.add_argument(
+        "--no-print-b64",
+        action="store_true",
+        help="No volcar el Base64 en la consola (recomendado para archivos grandes).",
     )
     parser.add_argument(
         "--no-show",
@@ -92,12 +770,28 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def run_batch(args: argparse.Namespace, key: bytes) -> None:
+    inputs = expand_batch_inputs(args.batch)
+    if not inputs:
+        print(f"ERROR: No hay archivos que cifrar en: {args.batch}")
+        sys.exit(1)
+    outputs, total, elapsed = encrypt_batch(
+        key, inputs, args.out_dir, args.workers, None if args.pool is None else args.pool == "process",
+        args.chunk_size, args.engine, args.mmap,
+    )
+    for in_path, out_path in zip(inputs, outputs):
+        print(f"{in_path} -> {out_path}")
+    elapsed = max(elapsed, 1e-9)
+    print(f"\nArchivos cifrados: {len(inputs)} ({total / 1e6:.2f} MB) en {elapsed:.2f} s")
+    print(f"Rendimiento: {len(inputs) / elapsed:.1f} archivos/s, {total / 1e6 / elapsed:.2f} MB/s")
+
+
 def main():
     args = parse_args()
 
     # 1) Validar input
     in_path = args.input
-    if not os.path.isfile(in_path):
+    if in_path is not None and not os.path.isfile(in_path):
         print(f"ERROR: No se encontró el archivo: {in_path}")
         sys.exit(1)
 
@@ -117,53 +811,93 @@ def main():
         key = os.urandom(nbytes)
         key_source = "generada aleatoriamente"
 
-    print("**** AES (Advanced Encryption Standard) - Modo CTR ****")
+    print(f"**** AES (Advanced Encryption Standard) - Modo {args.mode.upper()} ****")
     print(f"Nivel: {args.bits} bits")
+    print(f"Motor: {args.engine}")
     print(f"Clave ({key_source}): {key.hex()}")
 
-    # 3) Leer bytes de la imagen
-    plain = read_file_bytes(in_path)
-
-    # 4) Cifrar (CTR con nonce explícito)
-    msg = encrypt_aes_ctr(key, plain)
-
-    # 5) Codificar en Base64 y mostrar en consola
-    b64 = base64.b64encode(msg).decode("ascii")
-    print("\n--- MENSAJE CIFRADO EN BASE64 ---")
-    print(b64)
+    if args.chunk_size <= 0 or args.chunk_size % 16 != 0:
+        print("ERROR: --chunk-size debe ser un múltiplo positivo de 16.")
+        sys.exit(1)
+    if args.workers < 1:
+        print("ERROR: --workers debe ser al menos 1.")
+        sys.exit(1)
 
-    if args.save_b64:
-        write_file_bytes(args.save_b64, b64.encode("utf-8"))
-        print(f"(Guardado Base64 en: {args.save_b64})")
+    if args.auth and (args.mmap or args.batch or args.workers > 1):
+        print("ERROR: --auth no es compatible con --mmap, --batch ni --workers > 1.")
+        sys.exit(1)
 
-    # 6) Decodificar desde Base64 a bytes
-    msg_from_b64 = base64.b64decode(b64)
+    if args.mode == "cbc" and (args.auth or args.mmap or args.batch):
+        print("ERROR: --mode cbc no es compatible con --auth, --mmap ni --batch.")
+        sys.exit(1)
 
-    # 7) Descifrar
-    recovered = decrypt_aes_ctr(key, msg_from_b64)
+    if args.batch:
+        run_batch(args, key)
+        return
+
+    # 3-4) Cifrar en streaming (CTR con nonce explícito) directo al archivo de salida
+    if args.mode == "cbc":
+        encrypt_file_cbc(key, in_path, args.enc_out, args.chunk_size)
+    elif args.auth:
+        encrypt_file_auth(key, in_path, args.enc_out, args.chunk_size, args.engine)
+    elif args.mmap:
+        encrypt_file_mmap(key, in_path, args.enc_out, args.chunk_size, args.workers, args.engine)
+    else:
+        encrypt_file(key, in_path, args.enc_out, args.chunk_size, args.workers, args.engine)
+    print(f"Archivo cifrado guardado como: {args.enc_out}")
 
-    # 8) Escribir imagen recuperada y mostrar
     _, ext = split_ext(in_path)
     out_path = f"decrypted_image.{ext if ext else 'bin'}"
-    write_file_bytes(out_path, recovered)
+
+    with ExitStack() as stack:
+        # 5) Codificar en Base64 por trozos hacia la consola y/o el archivo --save-b64.
+        #    Si --save-b64 no es un archivo regular (p. ej. una tubería) el Base64
+        #    para la vuelta se guarda en un temporal.
+        sinks = []
+        if not args.no_print_b64:
+            print("\n--- MENSAJE CIFRADO EN BASE64 ---", flush=True)
+            sinks.append(sys.stdout.buffer)
+        if args.save_b64 and (not os.path.exists(args.save_b64) or os.path.isfile(args.save_b64)):
+            b64_file = stack.enter_context(open(args.save_b64, "w+b"))
+        else:
+            b64_file = stack.enter_context(tempfile.TemporaryFile())
+            if args.save_b64:
+                sinks.append(stack.enter_context(open(args.save_b64, "wb")))
+        sinks.append(b64_file)
+
+        with open(args.enc_out, "rb") as enc:
+            b64stream.encode_stream(enc, sinks)
+        if not args.no_print_b64:
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.flush()
+        if args.save_b64:
+            print(f"(Guardado Base64 en: {args.save_b64})")
+
+        # 6-8) Decodificar el Base64 por trozos, descifrar en streaming y escribir la imagen
+        #    La imagen se escribe en un temporal que solo se renombra si todo salió bien,
+        #    así un fallo de autenticación (o de relleno en CBC) no deja texto plano parcial.
+        b64_file.seek(0)
+        try:
+            with stream_io.replace_on_success(out_path) as dst:
+                if args.mode == "cbc":
+                    decrypt_aes_cbc_stream(key, b64stream.decoding_reader(b64_file), dst, args.chunk_size,
+                                           args.workers, args.engine)
+                elif args.auth:
+                    decrypt_aes_ctr_auth_stream(key, b64stream.decoding_reader(b64_file), dst, args.engine)
+                else:
+                    decrypt_aes_ctr_stream(key, b64stream.decoding_reader(b64_file), dst, args.chunk_size,
+                                           args.workers, args.engine)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
     print(f"\nImagen descifrada guardada como: {out_path}")
 
     if not args.no_show:
         try:
-            original_img = io.imread(in_path)
-            rec_img = io.imread(out_path)
-
-            plt.figure()
-            plt.title(f"Original: {os.path.basename(in_path)}")
-            plt.axis("off")
-            plt.imshow(original_img)
-
-            plt.figure()
-            plt.title(f"Recuperada: {os.path.basename(out_path)}")
-            plt.axis("off")
-            plt.imshow(rec_img)
-
-            plt.show()
+            preview.show_images([
+                (f"Original: {os.path.basename(in_path)}", in_path),
+                (f"Recuperada: {os.path.basename(out_path)}", out_path),
+            ])
         except Exception as e:
             print(f"Nota: no se pudieron mostrar las imágenes. Detalle: {e}")
 
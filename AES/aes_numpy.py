@@ -0,0 +1,276 @@
+# Motor AES vectorizado con NumPy (T-tables).
+# En lugar de cifrar bloque a bloque como pyaes, se guarda un lote de N estados
+# de 16 bytes como un arreglo (N, 4) de palabras uint32 (una por columna) y cada
+# ronda se aplica a todo el lote a la vez con búsquedas en tablas precalculadas.
+#
+# Uso directo: `python aes_numpy.py` ejecuta la verificación contra los vectores
+# de FIPS-197 (Apéndice C) y contra pyaes en modos CTR y CBC.
+
+import os
+
+import numpy as np
+
+# Bloques procesados por iteración en `ctr_xor` (16 bytes cada uno): 1 MiB.
+BATCH_BLOCKS = 1 << 16
+
+# Número de rondas según el tamaño de la clave en bytes.
+ROUNDS = {16: 10, 24: 12, 32: 14}
+
+
+def _build_tables():
+    """Genera la S-box, su inversa y las T-tables de cifrado y descifrado a partir de GF(2^8)."""
+    exp = [0] * 256
+    log = [0] * 256
+    x = 1
+    for i in range(255):
+        exp[i] = x
+        log[x] = i
+        # multiplicar por el generador 3 = x * 2 ^ x
+        x ^= ((x << 1) ^ (0x1B if x & 0x80 else 0)) & 0xFF
+    exp[255] = exp[0]
+
+    sbox = [0] * 256
+    for a in range(256):
+        inv = 0 if a == 0 else exp[(255 - log[a]) % 255]
+        s = inv
+        for shift in range(1, 5):
+            s ^= ((inv << shift) | (inv >> (8 - shift))) & 0xFF
+        sbox[a] = s ^ 0x63
+
+    inv_sbox = [0] * 256
+    for a in range(256):
+        inv_sbox[sbox[a]] = a
+
+    def mul(a, b):
+        return 0 if a == 0 or b == 0 else exp[(log[a] + log[b]) % 255]
+
+    def rotations(t0):
+        # T1..T3 son rotaciones de T0 (un byte a la derecha por tabla)
+        return (t0, (t0 >> np.uint32(8)) | (t0 << np.uint32(24)),
+                (t0 >> np.uint32(16)) | (t0 << np.uint32(16)),
+                (t0 >> np.uint32(24)) | (t0 << np.uint32(8)))
+
+    te0 = np.empty(256, dtype=np.uint32)
+    td0 = np.empty(256, dtype=np.uint32)
+    for a in range(256):
+        s = sbox[a]
+        te0[a] = (mul(s, 2) << 24) | (s << 16) | (s << 8) | mul(s, 3)
+        v = inv_sbox[a]
+        td0[a] = (mul(v, 14) << 24) | (mul(v, 9) << 16) | (mul(v, 13) << 8) | mul(v, 11)
+    return (np.array(sbox, dtype=np.uint32), np.array(inv_sbox, dtype=np.uint32),
+            rotations(te0), rotations(td0))
+
+
+SBOX, INV_SBOX, (TE0, TE1, TE2, TE3), (TD0, TD1, TD2, TD3) = _build_tables()
+
+
+def expand_key(key: bytes) -> np.ndarray:
+    """Expansión de clave AES. Devuelve 4*(Nr+1) palabras uint32."""
+    nk = len(key) // 4
+    if len(key) not in ROUNDS:
+        raise ValueError("La clave AES debe tener 16, 24 o 32 bytes.")
+    nr = ROUNDS[len(key)]
+    words = [int.from_bytes(key[4 * i:4 * i + 4], "big") for i in range(nk)]
+    sbox = SBOX.tolist()
+    rcon = 1
+    for i in range(nk, 4 * (nr + 1)):
+        t = words[i - 1]
+        if i % nk == 0:
+            t = ((t << 8) | (t >> 24)) & 0xFFFFFFFF
+            t = (sbox[t >> 24] << 24) | (sbox[(t >> 16) & 0xFF] << 16) | \
+                (sbox[(t >> 8) & 0xFF] << 8) | sbox[t & 0xFF]
+            t ^= rcon << 24
+            rcon = ((rcon << 1) ^ (0x11B if rcon & 0x80 else 0)) & 0xFF
+        elif nk > 6 and i % nk == 4:
+            t = (sbox[t >> 24] << 24) | (sbox[(t >> 16) & 0xFF] << 16) | \
+                (sbox[(t >> 8) & 0xFF] << 8) | sbox[t & 0xFF]
+        words.append(words[i - nk] ^ t)
+    return np.array(words, dtype=np.uint32)
+
+
+def _b0(w):
+    return w >> np.uint32(24)
+
+
+def _b1(w):
+    return (w >> np.uint32(16)) & np.uint32(0xFF)
+
+
+def _b2(w):
+    return (w >> np.uint32(8)) & np.uint32(0xFF)
+
+
+def _b3(w):
+    return w & np.uint32(0xFF)
+
+
+def encrypt_blocks(round_keys: np.ndarray, blocks: np.ndarray) -> np.ndarray:
+    """
+    Cifra un lote de bloques. `blocks` es un arreglo uint8 de forma (N, 16);
+    devuelve otro arreglo uint8 (N, 16) con los bloques cifrados.
+    """
+    nr = len(round_keys) // 4 - 1
+    rk = round_keys.reshape(-1, 4)
+    state = blocks.reshape(-1, 16).view(">u4").astype(np.uint32) ^ rk[0]
+    s0, s1, s2, s3 = state[:, 0], state[:, 1], state[:, 2], state[:, 3]
+    for r in range(1, nr):
+        k = rk[r]
+        t0 = TE0[_b0(s0)] ^ TE1[_b1(s1)] ^ TE2[_b2(s2)] ^ TE3[_b3(s3)] ^ k[0]
+        t1 = TE0[_b0(s1)] ^ TE1[_b1(s2)] ^ TE2[_b2(s3)] ^ TE3[_b3(s0)] ^ k[1]
+        t2 = TE0[_b0(s2)] ^ TE1[_b1(s3)] ^ TE2[_b2(s0)] ^ TE3[_b3(s1)] ^ k[2]
+        t3 = TE0[_b0(s3)] ^ TE1[_b1(s0)] ^ TE2[_b2(s1)] ^ TE3[_b3(s2)] ^ k[3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+
+    # Última ronda: SubBytes + ShiftRows + AddRoundKey (sin MixColumns)
+    k = rk[nr]
+    out = np.empty((len(s0), 4), dtype=">u4")
+    for col, (a, b, c, d) in enumerate(((s0, s1, s2, s3), (s1, s2, s3, s0),
+                                        (s2, s3, s0, s1), (s3, s0, s1, s2))):
+        out[:, col] = ((SBOX[_b0(a)] << np.uint32(24)) | (SBOX[_b1(b)] << np.uint32(16)) |
+                       (SBOX[_b2(c)] << np.uint32(8)) | SBOX[_b3(d)]) ^ k[col]
+    return out.view(np.uint8).reshape(-1, 16)
+
+
+def decryption_keys(round_keys: np.ndarray) -> np.ndarray:
+    """
+    Subclaves para el descifrado con T-tables ("equivalent inverse cipher"):
+    orden inverso y InvMixColumns aplicado a las rondas intermedias.
+    """
+    rk = round_keys.reshape(-1, 4)
+    nr = len(rk) - 1
+    dk = rk[::-1].copy()
+    mid = dk[1:nr]
+    # InvMixColumns(w) = Td0[S[b0]] ^ Td1[S[b1]] ^ Td2[S[b2]] ^ Td3[S[b3]]
+    dk[1:nr] = (TD0[SBOX[_b0(mid)]] ^ TD1[SBOX[_b1(mid)]] ^
+                TD2[SBOX[_b2(mid)]] ^ TD3[SBOX[_b3(mid)]])
+    return dk.reshape(-1)
+
+
+def decrypt_blocks(dec_keys: np.ndarray, blocks: np.ndarray) -> np.ndarray:
+    """
+    Descifra un lote de bloques uint8 (N, 16) con las subclaves de `decryption_keys`.
+    Cada bloque es independiente, así que sirve para ECB y para el descifrado CBC.
+    """
+    nr = len(dec_keys) // 4 - 1
+    dk = dec_keys.reshape(-1, 4)
+    state = blocks.reshape(-1, 16).view(">u4").astype(np.uint32) ^ dk[0]
+    s0, s1, s2, s3 = state[:, 0], state[:, 1], state[:, 2], state[:, 3]
+    for r in range(1, nr):
+        k = dk[r]
+        t0 = TD0[_b0(s0)] ^ TD1[_b1(s3)] ^ TD2[_b2(s2)] ^ TD3[_b3(s1)] ^ k[0]
+        t1 = TD0[_b0(s1)] ^ TD1[_b1(s0)] ^ TD2[_b2(s3)] ^ TD3[_b3(s2)] ^ k[1]
+        t2 = TD0[_b0(s2)] ^ TD1[_b1(s1)] ^ TD2[_b2(s0)] ^ TD3[_b3(s3)] ^ k[2]
+        t3 = TD0[_b0(s3)] ^ TD1[_b1(s2)] ^ TD2[_b2(s1)] ^ TD3[_b3(s0)] ^ k[3]
+        s0, s1, s2, s3 = t0, t1, t2, t3
+
+    # Última ronda: InvShiftRows + InvSubBytes + AddRoundKey
+    k = dk[nr]
+    out = np.empty((len(s0), 4), dtype=">u4")
+    for col, (a, b, c, d) in enumerate(((s0, s3, s2, s1), (s1, s0, s3, s2),
+                                        (s2, s1, s0, s3), (s3, s2, s1, s0))):
+        out[:, col] = ((INV_SBOX[_b0(a)] << np.uint32(24)) | (INV_SBOX[_b1(b)] << np.uint32(16)) |
+                       (INV_SBOX[_b2(c)] << np.uint32(8)) | INV_SBOX[_b3(d)]) ^ k[col]
+    return out.view(np.uint8).reshape(-1, 16)
+
+
+def ecb_decrypt(dec_keys: np.ndarray, data) -> bytes:
+    """Descifra bloque a bloque (sin encadenar) `data`, múltiplo de 16 bytes, por lotes."""
+    src = np.frombuffer(data, dtype=np.uint8).reshape(-1, 16)
+    out = np.empty_like(src)
+    for start in range(0, len(src), BATCH_BLOCKS):
+        out[start:start + BATCH_BLOCKS] = decrypt_blocks(dec_keys, src[start:start + BATCH_BLOCKS])
+    return out.tobytes()
+
+
+def counter_blocks(initial_value: int, block_offset: int, count: int) -> np.ndarray:
+    """
+    Genera `count` bloques de contador de 128 bits (big-endian), empezando en
+    `initial_value + block_offset`, con el mismo desborde que pyaes.Counter.
+    """
+    base = (initial_value + block_offset) % (1 << 128)
+    base_hi = np.uint64(base >> 64)
+    base_lo = np.uint64(base & 0xFFFFFFFFFFFFFFFF)
+    lo = base_lo + np.arange(count, dtype=np.uint64)  # desborda módulo 2^64
+    hi = base_hi + (lo < base_lo).astype(np.uint64)
+    ctr = np.empty((count, 2), dtype=">u8")
+    ctr[:, 0] = hi
+    ctr[:, 1] = lo
+    return ctr.view(np.uint8).reshape(count, 16)
+
+
+def ctr_xor_into(round_keys: np.ndarray, initial_value: int, block_offset: int, data, out) -> None:
+    """
+    Aplica el keystream CTR a `data` y escribe el resultado en `out` (cualquier
+    buffer escribible del mismo tamaño: bytearray, memoryview de un mmap...).
+    El trabajo se hace por lotes de BATCH_BLOCKS, sin copias completas de `data`.
+    """
+    src = np.frombuffer(data, dtype=np.uint8)
+    dst = np.frombuffer(out, dtype=np.uint8)
+    if len(dst) != len(src):
+        raise ValueError("El buffer de salida debe tener el mismo tamaño que la entrada.")
+    step = BATCH_BLOCKS * 16
+    for start in range(0, len(src), step):
+        piece = src[start:start + step]
+        nblocks = (len(piece) + 15) // 16
+        ks = encrypt_blocks(round_keys, counter_blocks(initial_value, block_offset + start // 16, nblocks))
+        np.bitwise_xor(piece, ks.reshape(-1)[:len(piece)], out=dst[start:start + len(piece)])
+
+
+def ctr_xor(round_keys: np.ndarray, initial_value: int, block_offset: int, data) -> bytes:
+    """
+    Aplica el keystream CTR a `data` (bytes o memoryview), empezando en el bloque
+    `block_offset` del contador que inicia en `initial_value`.
+    Es compatible byte a byte con pyaes.AESModeOfOperationCTR.
+    """
+    out = bytearray(len(data))
+    ctr_xor_into(round_keys, initial_value, block_offset, data, out)
+    return bytes(out)
+
+
+# Vectores de prueba de FIPS-197, Apéndice C (clave, texto plano, texto cifrado).
+FIPS197_VECTORS = [
+    ("000102030405060708090a0b0c0d0e0f",
+     "00112233445566778899aabbccddeeff", "69c4e0d86a7b0430d8cdb78070b4c55a"),
+    ("000102030405060708090a0b0c0d0e0f1011121314151617",
+     "00112233445566778899aabbccddeeff", "dda97ca4864cdfe06eaf70a0ec0d7191"),
+    ("000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f",
+     "00112233445566778899aabbccddeeff", "8ea2b7ca516745bfeafc49904b496089"),
+]
+
+
+def verify_engine() -> None:
+    """Comprueba el motor contra FIPS-197 y contra pyaes (CTR y CBC). Lanza AssertionError si falla."""
+    for key_hex, pt_hex, ct_hex in FIPS197_VECTORS:
+        rk = expand_key(bytes.fromhex(key_hex))
+        block = np.frombuffer(bytes.fromhex(pt_hex), dtype=np.uint8).reshape(1, 16)
+        got = encrypt_blocks(rk, block).tobytes().hex()
+        assert got == ct_hex, f"FIPS-197 ({len(key_hex) * 4} bits): {got} != {ct_hex}"
+        block = np.frombuffer(bytes.fromhex(ct_hex), dtype=np.uint8).reshape(1, 16)
+        back = decrypt_blocks(decryption_keys(rk), block)
+        assert back.tobytes().hex() == pt_hex, f"FIPS-197 descifrado ({len(key_hex) * 4} bits)"
+
+    import pyaes
+
+    for nbytes in (16, 24, 32):
+        key = os.urandom(nbytes)
+        data = os.urandom(4099)
+        # contador cercano al desborde de la mitad baja para probar el acarreo
+        initial_value = (1 << 64) - 5
+        expected = pyaes.AESModeOfOperationCTR(key, pyaes.Counter(initial_value)).encrypt(data)
+        assert ctr_xor(expand_key(key), initial_value, 0, data) == expected, "CTR distinto de pyaes"
+        assert ctr_xor(expand_key(key), initial_value, 7, data[112:]) == expected[112:], \
+            "CTR con desplazamiento distinto de pyaes"
+
+        # descifrado de bloques frente a pyaes en CBC: D(C_i) xor C_{i-1}
+        iv = os.urandom(16)
+        cbc = pyaes.AESModeOfOperationCBC(key, iv)
+        plain = data[:4096]
+        ciphertext = b"".join(cbc.encrypt(plain[i:i + 16]) for i in range(0, len(plain), 16))
+        decrypted = np.frombuffer(ecb_decrypt(decryption_keys(expand_key(key)), ciphertext), dtype=np.uint8)
+        previous = np.frombuffer(iv + ciphertext[:-16], dtype=np.uint8)
+        assert (decrypted ^ previous).tobytes() == plain, "descifrado CBC distinto de pyaes"
+
+
+if __name__ == "__main__":
+    verify_engine()
+    print("OK: motor NumPy coincide con FIPS-197 y con pyaes.")
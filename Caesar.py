@@ -1,42 +1,282 @@
+# ===== Cifrado César =====
+# Solo se desplazan las letras a-z; el resto de caracteres (espacios, signos,
+# mayúsculas, tildes...) pasan sin cambios.
+#
+# Uso como módulo:
+#   from Caesar import caesar_encrypt, caesar_decrypt
+#   caesar_encrypt("hola mundo", 3)       -> "krod pxqgr"
+#   caesar_encrypt(b"hola mundo", 3)      -> b"krod pxqgr"
+#   caesar_encrypt_np(datos_grandes, 3)   (NumPy, para buffers de varios MB)
+#   crack("krod pxqgr")                   -> candidatos [(k, chi2, texto), ...]
+#   crack_batch([c1, c2, ...])            -> mejor k de cada cifrado
+#   caesar_stream(src, dst, 3)            (archivos/tuberías por trozos)
+#
+# Uso como programa:
+#   python Caesar.py                                  (modo interactivo)
+#   python Caesar.py encrypt -k 3 -i in.txt -o out.txt
+#   cat out.txt | python Caesar.py decrypt -k 3 > in.txt
+
+import argparse
+import codecs
+import sys
+from contextlib import ExitStack
+from functools import lru_cache
+from typing import BinaryIO
+
+from comun import stream_io
+
 # ===== Diccionario =====
-arr_ = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j', 'k', 'l',
-        'm', 'n', 'o', 'p', 'q', 'r', 's', 't', 'u', 'v', 'w', 'x',
-        'y', 'z']
+ALFABETO = "abcdefghijklmnopqrstuvwxyz"
+
+
+# ===== Tablas de traducción (una por desplazamiento, se calculan una vez) =====
+@lru_cache(maxsize=26)
+def _bytes_table(k: int) -> bytes:
+    k %= 26
+    ab = ALFABETO.encode("ascii")
+    return bytes.maketrans(ab, ab[k:] + ab[:k])
+
+
+# ===== Cifrar / descifrar =====
+def caesar_encrypt(text, k: int):
+    """
+    Desplaza `k` posiciones las letras a-z de `text` (str o bytes-like) y
+    devuelve el mismo tipo (bytes para cualquier bytes-like).
+    """
+    if isinstance(text, str):
+        if text.isascii():
+            return text.encode("ascii").translate(_bytes_table(k % 26)).decode("ascii")
+        # En UTF-8 los bytes de un carácter no ASCII son todos >= 0x80, así que
+        # la tabla de bytes nunca los toca y el resultado sigue siendo UTF-8 válido.
+        data = text.encode("utf-8", "surrogatepass").translate(_bytes_table(k % 26))
+        return data.decode("utf-8", "surrogatepass")
+    return bytes(text).translate(_bytes_table(k % 26))
+
+
+def caesar_decrypt(text, k: int):
+    """Inverso de `caesar_encrypt`."""
+    return caesar_encrypt(text, -k)
+
+
+def caesar_encrypt_np(data, k: int, out=None):
+    """
+    Variante NumPy para buffers grandes: `data` es cualquier bytes-like (bytes,
+    mmap, arreglo uint8...) y cada byte se traduce con una tabla de 256 entradas.
+    Si se pasa `out` (arreglo uint8 del mismo largo) se escribe ahí sin reservar
+    memoria nueva. Devuelve un arreglo uint8.
+    """
+    import numpy as np  # se importa aquí para que el script interactivo arranque rápido
+
+    src = np.frombuffer(data, dtype=np.uint8)
+    lut = np.frombuffer(_bytes_table(k % 26), dtype=np.uint8)
+    if out is None:
+        return lut[src]
+    return np.take(lut, src, out=out)
+
+
+def caesar_decrypt_np(data, k: int, out=None):
+    """Inverso de `caesar_encrypt_np`."""
+    return caesar_encrypt_np(data, -k, out)
+
+
+# ===== Criptoanálisis (chi-cuadrado) =====
+# Frecuencia de cada letra a-z en porcentaje (en español, las vocales con tilde
+# se cuentan como la vocal sin tilde).
+FRECUENCIAS = {
+    "en": (8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+           6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074),
+    "es": (11.525, 2.215, 4.019, 5.010, 12.181, 0.692, 1.768, 0.703, 6.247, 0.493, 0.011, 4.967, 3.157,
+           6.712, 8.683, 2.510, 0.877, 6.871, 7.977, 4.632, 2.927, 1.138, 0.017, 0.215, 1.008, 0.467),
+}
+
+
+def _as_bytes(text) -> bytes:
+    return text.encode("utf-8", "surrogatepass") if isinstance(text, str) else bytes(text)
+
+
+def letter_counts(text):
+    """Histograma de las letras a-z de `text` (str o bytes-like) en un solo recorrido."""
+    import numpy as np
 
-dicc = {letra: i for i, letra in enumerate(arr_)}   # letra -> número
-inv = {i: letra for letra, i in dicc.items()}        # número -> letra
+    counts = np.bincount(np.frombuffer(_as_bytes(text), dtype=np.uint8), minlength=256)
+    return counts[97:123]
 
-# ===== Entradas =====
-action = input("¿Quieres cifrar (1) o descifrar (0)?: ").strip()
 
-# Validación de action
-if action not in ("1", "0"):
-    print("Opción inválida. Usa '1' para cifrar o '0' para descifrar.")
-    exit(1)
+def chi2_scores(counts, lang: str = "es"):
+    """
+    Chi-cuadrado de las 26 claves a la vez. `counts` es un histograma (26,) o un
+    lote (N, 26). Descifrar con la clave k convierte la letra j+k en la j, así que
+    el histograma del texto descifrado es `counts` rotado k posiciones: la matriz
+    `counts[..., idx]` de 26x26 tiene en la fila k ese histograma rotado y se
+    compara en una sola operación con las frecuencias esperadas.
+    Devuelve un arreglo (26,) o (N, 26) con el chi-cuadrado de cada clave.
+    """
+    import numpy as np
 
-action = int(action)  # lo convertimos a número
+    counts = np.asarray(counts, dtype=np.float64)
+    freq = np.asarray(FRECUENCIAS[lang]) / 100.0
+    idx = (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26
+    rotated = counts[..., idx]                                    # (..., 26 claves, 26 letras)
+    total = np.maximum(counts.sum(axis=-1), 1.0)[..., None, None]
+    expected = total * freq
+    return ((rotated - expected) ** 2 / expected).sum(axis=-1)
 
-message = input("Mensaje: ").strip().lower()
-k = int(input("Parámetro k (desplazamiento): "))
 
-# ===== Proceso =====
-resultado = []
+def crack(text, lang: str = "es", top: int = 3):
+    """
+    Rompe un cifrado César sin conocer la clave. Devuelve las `top` claves más
+    probables como [(k, chi2, texto_descifrado), ...], de mejor a peor.
+    """
+    scores = chi2_scores(letter_counts(text), lang)
+    ranking = scores.argsort(kind="stable")[:top]
+    return [(int(k), float(scores[k]), caesar_decrypt(text, int(k))) for k in ranking]
 
-for letter in message:
-    if letter not in dicc:   # ignorar caracteres que no son letras
-        resultado.append(letter)
-        continue
 
-    pos = dicc[letter]
+def crack_batch(texts, lang: str = "es"):
+    """
+    Versión por lotes de `crack` para auditar muchos cifrados: un único
+    `np.bincount` sobre todos los textos concatenados (cada byte desplazado
+    256 * índice del texto) da los N histogramas, y se puntúan las 26 claves de
+    todos a la vez. Devuelve (claves, chi2), dos arreglos de largo N.
+    """
+    import numpy as np
 
+    chunks = [_as_bytes(t) for t in texts]
+    if not chunks:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+    data = np.frombuffer(b"".join(chunks), dtype=np.uint8)
+    owner = np.repeat(np.arange(len(chunks)) * 256, [len(c) for c in chunks])
+    counts = np.bincount(owner + data, minlength=256 * len(chunks)).reshape(len(chunks), 256)[:, 97:123]
+    scores = chi2_scores(counts, lang)
+    keys = scores.argmin(axis=1)
+    return keys, scores[np.arange(len(chunks)), keys]
+
+
+# ===== Modo streaming (archivos o stdin/stdout) =====
+# Bytes leídos por trozo: la memoria usada es O(CHUNK_SIZE) sea cual sea la entrada.
+CHUNK_SIZE = 1 << 20
+
+
+def caesar_stream(src: BinaryIO, dst: BinaryIO, k: int, chunk_size: int = CHUNK_SIZE,
+                  lower: bool = False) -> int:
+    """
+    Aplica el desplazamiento `k` a `src` por trozos de `chunk_size` bytes y
+    escribe cada trozo en `dst` apenas está listo. Devuelve los bytes leídos.
+
+    Sin `lower` se trabaja byte a byte con la tabla de traducción: en UTF-8 los
+    bytes de un carácter multibyte son todos >= 0x80, así que un carácter
+    partido entre dos trozos sale intacto. Con `lower` el texto se pasa antes a
+    minúsculas (como el modo interactivo, incluidas Ñ, É...), lo que exige
+    decodificar: un decodificador incremental guarda los bytes de un carácter
+    incompleto hasta el trozo siguiente. Los bytes que no son UTF-8 válido se
+    conservan tal cual (surrogateescape).
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size debe ser positivo.")
+    table = _bytes_table(k % 26)
+    decoder = codecs.getincrementaldecoder("utf-8")("surrogateescape") if lower else None
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    total = 0
+    while True:
+        n = src.readinto(view)
+        if not n:
+            break
+        total += n
+        if decoder is None:
+            dst.write(view[:n].tobytes().translate(table))
+        else:
+            text = decoder.decode(view[:n]).lower()
+            dst.write(caesar_encrypt(text, k).encode("utf-8", "surrogateescape"))
+    if decoder is not None:
+        dst.write(caesar_encrypt(decoder.decode(b"", final=True).lower(), k).encode("utf-8", "surrogateescape"))
+    return total
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Cifrado César. Sin acción se ejecuta el modo interactivo."
+    )
+    parser.add_argument(
+        "action",
+        nargs="?",
+        choices=("encrypt", "decrypt"),
+        help="encrypt o decrypt: procesa --input en streaming y escribe en --output.",
+    )
+    parser.add_argument("--shift", "-k", type=int, help="Desplazamiento k.")
+    parser.add_argument("--input", "-i", default="-", help="Archivo de entrada; '-' = stdin (por defecto).")
+    parser.add_argument("--output", "-o", default="-", help="Archivo de salida; '-' = stdout (por defecto).")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help=f"Bytes por trozo (por defecto: {CHUNK_SIZE}).",
+    )
+    parser.add_argument(
+        "--lower",
+        action="store_true",
+        help="Pasar el texto a minúsculas antes de desplazar (como el modo interactivo).",
+    )
+    return parser.parse_args()
+
+
+def run_stream(args: argparse.Namespace) -> None:
+    if args.shift is None:
+        print("ERROR: encrypt/decrypt necesitan el desplazamiento (-k).", file=sys.stderr)
+        sys.exit(1)
+    k = args.shift if args.action == "encrypt" else -args.shift
+    try:
+        with ExitStack() as stack:
+            src = stream_io.open_binary(args.input, "rb", stack)
+            dst = stream_io.open_binary(args.output, "wb", stack)
+            caesar_stream(src, dst, k, args.chunk_size, args.lower)
+            dst.flush()
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def interactive():
+    # ===== Entradas =====
+    action = input("¿Quieres cifrar (1), descifrar (0) o romper sin clave (2)?: ").strip()
+
+    # Validación de action
+    if action not in ("1", "0", "2"):
+        print("Opción inválida. Usa '1' para cifrar, '0' para descifrar o '2' para romper.")
+        exit(1)
+
+    action = int(action)  # lo convertimos a número
+
+    message = input("Mensaje: ").strip().lower()
+
+    if action == 2:  # Romper: probar las 26 claves y ordenar por chi-cuadrado
+        lang = input("Idioma del texto original (es/en) [es]: ").strip().lower() or "es"
+        if lang not in FRECUENCIAS:
+            print("Idioma inválido. Usa 'es' o 'en'.")
+            exit(1)
+        for k, chi2, texto in crack(message, lang):
+            print(f"k = {k:2d}  chi2 = {chi2:10.2f}  {texto}")
+        return
+
+    k = int(input("Parámetro k (desplazamiento): "))
+
+    # ===== Proceso =====
     if action == 1:  # Cifrar
-        nueva_pos = (pos + k) % 26
-        resultado.append(inv[nueva_pos])
+        texto_final = caesar_encrypt(message, k)
+    else:  # Descifrar
+        texto_final = caesar_decrypt(message, k)
+
+    # ===== Salida =====
+    print("Resultado:", texto_final)
+
+
+def main():
+    args = parse_args()
+    if args.action is None:
+        interactive()
+    else:
+        run_stream(args)
 
-    elif action == 0:  # Descifrar
-        nueva_pos = (pos - k) % 26
-        resultado.append(inv[nueva_pos])
 
-# ===== Salida =====
-texto_final = "".join(resultado)
-print("Resultado:", texto_final)
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,411 @@
-# DES (pyDes) demo: cifra una imagen, la imprime en Base64, la descifra y la muestra.
+# DES demo: cifra una imagen, la imprime en Base64, la descifra y la muestra.
+# También admite 3DES EDE (2 o 3 claves) para intercambiar datos con sistemas heredados.
+#
+# Uso:
+#   python DES.py [demo] -i foto.png                       (demostración completa)
+#   python DES.py encrypt --keyhex 4b4559... < in > out     (solo cifrar, en streaming)
+#   python DES.py decrypt --keyenv DES_KEY -i out -o in     (solo descifrar)
+# Formato del cifrado: [IV(8)][CIPHERTEXT CBC con relleno PKCS5]. El IV es aleatorio.
 
-import base64
+import argparse
+import copy
 import os
-from pyDes import des, CBC, PAD_PKCS5
-import matplotlib.pyplot as plt
-from skimage import io
+import sys
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from typing import BinaryIO, Optional, Tuple
 
-def main():
+# Permite importar los módulos compartidos de la carpeta raíz del repositorio (comun/).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun import b64stream, cbc_parallel, key_cache, mmap_io, preview, stream_io  # noqa: E402
+
+# Motor DES por tablas (des_fast.py), compatible con la interfaz de pyDes.
+from des_fast import des, triple_des, ecb_np, schedule_for, CBC, PAD_NORMAL, PAD_PKCS5  # noqa: E402
+
+# Bytes por trozo al cifrar con mmap o en streaming (múltiplo de 8, el bloque DES).
+CHUNK_SIZE = 1 << 20
+BLOCK_SIZE = 8
+
+# Algoritmos disponibles y largo de su clave. 3DES con 2 claves usa K1,K2,K1;
+# con 3 claves, K1,K2,K3.
+KEY_SIZES = {"des": 8, "3des2": 16, "3des3": 24}
+
+ACTIONS = ("demo", "encrypt", "decrypt")
+
+
+def des_cipher(key_bytes, iv_bytes):
+    """
+    Devuelve un objeto DES (des_fast, misma interfaz que pyDes) en modo CBC/PKCS5.
+    Con una clave de 16 o 24 bytes devuelve 3DES EDE. Las subclaves se calculan una
+    sola vez por clave (caché compartida) y cada llamada recibe una copia ligera
+    con su propio IV.
+    """
+    if len(key_bytes) == 8:
+        base = key_cache.get_schedule("des", key_bytes, des)
+    else:
+        base = key_cache.get_schedule("3des", key_bytes, triple_des)
+    cipher = copy.copy(base)
+    cipher.setMode(CBC)
+    cipher.setIV(iv_bytes)
+    cipher.setPadMode(PAD_PKCS5)
+    return cipher
+
+
+def _des_ecb_decrypt(key_bytes, data):
+    """Paso D() de CBC sobre un tramo de bloques; función de módulo para los workers."""
+    subkeys = key_cache.get_schedule("des-subkeys", key_bytes, schedule_for)
+    return ecb_np(data, subkeys[::-1])
+
+
+def des_encrypt_into(cipher, src, dst, chunk_size=CHUNK_SIZE):
+    """
+    Cifra en CBC/PKCS5 el buffer `src` y escribe en `dst` (ambos memoryview, p. ej.
+    de archivos mapeados), de `chunk_size` en `chunk_size` bytes. Entre trozos el
+    IV pasa a ser el último bloque cifrado, así que el resultado es el mismo que
+    cifrar todo de una vez. `dst` debe medir (len(src) // 8 + 1) * 8 bytes.
+    """
+    stream_io.check_chunk_size(chunk_size, BLOCK_SIZE)
+    pos = 0
+    while len(src) - pos > chunk_size:
+        block = cipher.encrypt(bytes(src[pos:pos + chunk_size]), padmode=PAD_NORMAL)
+        dst[pos:pos + chunk_size] = block
+        cipher.setIV(block[-8:])
+        pos += chunk_size
+    # último trozo: lleva el relleno PKCS5
+    block = cipher.encrypt(bytes(src[pos:]), padmode=PAD_PKCS5)
+    dst[pos:pos + len(block)] = block
+    return pos + len(block)
+
+
+def des_decrypt_into(cipher, src, dst, chunk_size=CHUNK_SIZE):
+    """
+    Inverso de `des_encrypt_into`: descifra `src` en `dst` (mismo tamaño) y
+    devuelve el número de bytes útiles, ya sin el relleno PKCS5. Lanza ValueError
+    si el relleno no es válido (clave incorrecta o datos dañados).
+    """
+    stream_io.check_chunk_size(chunk_size, BLOCK_SIZE)
+    if len(src) == 0 or len(src) % 8 != 0:
+        raise ValueError("El cifrado DES-CBC debe medir un múltiplo de 8 bytes.")
+    pos = 0
+    while len(src) - pos > chunk_size:
+        block = bytes(src[pos:pos + chunk_size])
+        dst[pos:pos + chunk_size] = cipher.decrypt(block, padmode=PAD_NORMAL)
+        cipher.setIV(block[-8:])
+        pos += chunk_size
+    # PAD_PKCS5 de pyDes quita data[-1] bytes sin comprobar nada: se valida aparte
+    plain = stream_io.pkcs_unpad(cipher.decrypt(bytes(src[pos:]), padmode=PAD_NORMAL), BLOCK_SIZE, "PKCS5")
+    dst[pos:pos + len(plain)] = plain
+    return pos + len(plain)
+
+
+def des_encrypt_file_mmap(key_bytes, in_path, out_path, chunk_size=CHUNK_SIZE, iv_bytes=None):
+    """
+    Cifra `in_path` en `out_path` ([IV][CIPHERTEXT]) usando mmap para la entrada
+    y la salida. Si no se indica `iv_bytes` se genera uno aleatorio.
+    """
+    iv_bytes = iv_bytes or os.urandom(BLOCK_SIZE)
+    length = os.path.getsize(in_path)
+    with mmap_io.map_input(in_path) as src, \
+            mmap_io.map_output(out_path, BLOCK_SIZE + (length // 8 + 1) * 8) as dst:
+        dst[:BLOCK_SIZE] = iv_bytes
+        body = dst[BLOCK_SIZE:]
+        try:
+            return BLOCK_SIZE + des_encrypt_into(des_cipher(key_bytes, iv_bytes), src, body, chunk_size)
+        finally:
+            body.release()
+
+
+def des_decrypt_file_mmap(key_bytes, in_path, out_path, chunk_size=CHUNK_SIZE):
+    """
+    Descifra con mmap sobre un temporal que se recorta para quitar el relleno y solo
+    se renombra a `out_path` si todo salió bien: ante un fallo no queda salida parcial.
+    """
+    length = os.path.getsize(in_path)
+    if length < 2 * BLOCK_SIZE:
+        raise ValueError("Mensaje inválido: no contiene IV y al menos un bloque.")
+    with stream_io.staged_path(out_path) as tmp_path:
+        with mmap_io.map_input(in_path) as src, mmap_io.map_output(tmp_path, length - BLOCK_SIZE) as dst:
+            iv, body = bytes(src[:BLOCK_SIZE]), src[BLOCK_SIZE:]
+            try:
+                size = des_decrypt_into(des_cipher(key_bytes, iv), body, dst, chunk_size)
+            finally:
+                body.release()
+        os.truncate(tmp_path, size)
+    return size
+
+
+def des_encrypt_stream(key_bytes, src: BinaryIO, dst: BinaryIO, chunk_size: int = CHUNK_SIZE,
+                       iv_bytes: Optional[bytes] = None) -> int:
+    """
+    Cifra `src` en `dst` por trozos de `chunk_size` bytes con el formato
+    [IV(8)][CIPHERTEXT]. Solo el último trozo lleva relleno PKCS5, por eso se lee
+    siempre un trozo por adelantado. Devuelve los bytes escritos.
+    """
+    stream_io.check_chunk_size(chunk_size, BLOCK_SIZE)
+    iv_bytes = iv_bytes or os.urandom(BLOCK_SIZE)
+    cipher = des_cipher(key_bytes, iv_bytes)
+    dst.write(iv_bytes)
+    written = len(iv_bytes)
+    chunk = stream_io.read_exact(src, chunk_size)
+    while True:
+        following = stream_io.read_exact(src, chunk_size) if len(chunk) == chunk_size else b""
+        block = cipher.encrypt(chunk, padmode=PAD_NORMAL if following else PAD_PKCS5)
+        dst.write(block)
+        written += len(block)
+        if not following:
+            return written
+        cipher.setIV(block[-BLOCK_SIZE:])
+        chunk = following
+
+
+def des_decrypt_stream(key_bytes, src: BinaryIO, dst: BinaryIO, chunk_size: int = CHUNK_SIZE,
+                       workers: int = 1) -> int:
+    """
+    Descifra [IV(8)][CIPHERTEXT] por trozos. El último trozo se retiene hasta
+    saber que no viene otro, para quitarle el relleno. Con `workers > 1` cada
+    trozo se reparte entre un pool de procesos. Devuelve los bytes escritos.
+    """
+    stream_io.check_chunk_size(chunk_size, BLOCK_SIZE)
+    prev = stream_io.read_exact(src, BLOCK_SIZE)
+    chunk = stream_io.read_exact(src, chunk_size)
+    if len(prev) < BLOCK_SIZE or not chunk:
+        raise ValueError("Mensaje inválido: no contiene IV y al menos un bloque.")
+    ecb_decrypt = partial(_des_ecb_decrypt, bytes(key_bytes))
+    pool: Optional[Executor] = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    written = 0
+    try:
+        while True:
+            following = stream_io.read_exact(src, chunk_size) if len(chunk) == chunk_size else b""
+            if len(chunk) % BLOCK_SIZE != 0:
+                raise ValueError("El cifrado DES-CBC debe medir un múltiplo de 8 bytes.")
+            plain = cbc_parallel.cbc_decrypt(ecb_decrypt, prev, chunk, workers, pool)
+            if not following:
+                plain = stream_io.pkcs_unpad(plain, BLOCK_SIZE, "PKCS5")
+            dst.write(plain)
+            written += len(plain)
+            if not following:
+                return written
+            prev = chunk[-BLOCK_SIZE:]
+            chunk = following
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def load_key(args: argparse.Namespace) -> Tuple[Optional[bytes], str]:
+    """
+    Obtiene la clave de --keyhex, --keyfile (texto hex, o bytes crudos con
+    --keyfile-format raw) o --keyenv (variable de entorno con la clave en hex).
+    Devuelve (None, "") si no se indicó ninguna. Lanza ValueError si la clave no
+    es válida para el algoritmo elegido.
+    """
+    nbytes = KEY_SIZES[args.algo]
+    if args.keyhex:
+        text, source = args.keyhex, "proporcionada (HEX)"
+    elif args.keyfile:
+        with open(args.keyfile, "rb") as f:
+            raw = f.read()
+        if args.keyfile_format == "raw":
+            if len(raw) != nbytes:
+                raise ValueError(f"el archivo de clave debe tener {nbytes} bytes crudos para {args.algo}.")
+            return raw, f"archivo {args.keyfile} (bytes crudos)"
+        text, source = raw.decode("ascii", "replace"), f"archivo {args.keyfile}"
+    elif args.keyenv:
+        text = os.environ.get(args.keyenv)
+        if text is None:
+            raise ValueError(f"la variable de entorno {args.keyenv} no está definida.")
+        source = f"variable de entorno {args.keyenv}"
+    else:
+        return None, ""
+    try:
+        key = bytes.fromhex(text.strip())
+    except ValueError:
+        raise ValueError("la clave no es hex válido.") from None
+    if len(key) != nbytes:
+        raise ValueError(f"la clave debe tener {nbytes} bytes ({nbytes * 2} caracteres hex) para {args.algo}.")
+    return key, source
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Cifrar/descifrar con DES o 3DES (CBC). Sin acción se ejecuta la demostración con imagen."
+    )
+    parser.add_argument(
+        "action",
+        nargs="?",
+        choices=ACTIONS,
+        default="demo",
+        help="demo (cifra, muestra Base64, descifra y muestra la imagen), encrypt o decrypt "
+        "(solo cifrar/descifrar, aptos para tuberías).",
+    )
+    parser.add_argument(
+        "--input", "-i",
+        help="Archivo de entrada; '-' = stdin (por defecto en encrypt/decrypt). En demo se pregunta si falta.",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        default="-",
+        help="encrypt/decrypt: archivo de salida; '-' = stdout (por defecto).",
+    )
+    parser.add_argument(
+        "--algo", "-a",
+        choices=sorted(KEY_SIZES),
+        default="des",
+        help="Algoritmo: des (clave de 8 bytes), 3des2 (16 bytes) o 3des3 (24 bytes).",
+    )
+    key = parser.add_mutually_exclusive_group()
+    key.add_argument("--keyhex", help="Clave en HEX (16/32/48 hex-chars para des/3des2/3des3).")
+    key.add_argument("--keyfile", help="Archivo con la clave (texto hex, o bytes crudos con --keyfile-format raw).")
+    key.add_argument("--keyenv", help="Nombre de la variable de entorno con la clave en HEX.")
+    parser.add_argument(
+        "--keyfile-format",
+        choices=("hex", "raw"),
+        default="hex",
+        help="Formato de --keyfile: hex (texto, por defecto) o raw (bytes crudos del tamaño de la clave).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help=f"Tamaño de bloque para cifrar en streaming, múltiplo de 8 (por defecto: {CHUNK_SIZE}).",
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="decrypt/demo: número de procesos para descifrar CBC en paralelo (por defecto: 1).",
+    )
+    parser.add_argument(
+        "--enc-out",
+        default="encrypted_image.bin",
+        help="demo: ruta del archivo cifrado [IV][CIPHERTEXT] (por defecto: encrypted_image.bin).",
+    )
+    parser.add_argument(
+        "--save-b64",
+        help="demo: ruta donde guardar también el Base64.",
+    )
+    parser.add_argument(
+        "--no-print-b64",
+        action="store_true",
+        help="demo: no volcar el Base64 en la consola (recomendado para archivos grandes).",
+    )
+    parser.add_argument(
+        "--no-show",
+        action="store_true",
+        help="demo: no mostrar la imagen con matplotlib (útil en ejecución headless).",
+    )
+    return parser.parse_args()
+
+
+def run_stream(args: argparse.Namespace, key: bytes) -> None:
+    """Acciones encrypt/decrypt: todo lo que no son datos va a stderr."""
+    try:
+        with ExitStack() as stack:
+            src = stream_io.open_binary(args.input or "-", "rb", stack)
+            dst = stream_io.open_binary(args.output, "wb", stack)
+            if args.action == "encrypt":
+                des_encrypt_stream(key, src, dst, args.chunk_size)
+            else:
+                des_decrypt_stream(key, src, dst, args.chunk_size, args.workers)
+            dst.flush()
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_demo(args: argparse.Namespace, key: Optional[bytes], key_source: str) -> None:
     print("**** DES (Data Encryption Standard) ****\n")
 
-    # 1) Pedir ruta del archivo
-    im = input("Introduzca el nombre del archivo con su extensión (por ej. foto.png): ").strip()
+    # 1) Ruta del archivo (se pregunta si no vino por --input)
+    im = args.input or input("Introduzca el nombre del archivo con su extensión (por ej. foto.png): ").strip()
     if not os.path.isfile(im):
         print(f"ERROR: No se encontró el archivo: {im}")
-        return
+        sys.exit(1)
 
     # 2) Separar nombre y extensión de forma robusta
     sname, ext = os.path.splitext(im)
     ext = ext.lstrip(".")  # quitar el punto inicial
 
-    # 3) Leer bytes del archivo en binario
-    with open(im, "rb") as f:
-        image_bytes = f.read()
+    # 3) Clave (aleatoria si no se indicó) e IV aleatorio, guardado al inicio del cifrado
+    #    ¡OJO! DES (y 3DES) son inseguros; esto es solo para demostración.
+    if key is None:
+        key = os.urandom(KEY_SIZES[args.algo])
+        key_source = "generada aleatoriamente"
+    print(f"Algoritmo: {args.algo}")
+    print(f"Clave ({key_source}): {key.hex()}")
 
-    # 4) Configurar DES: clave de 8 bytes e IV de 8 bytes
-    #    ¡OJO! DES es inseguro; esto es solo para demostración.
-    key_bytes = b"KEYSANTI"                 # 8 bytes exactos
-    iv_bytes = b"\x00\x00\x00\x00\x00\x00\x00\x00"  # IV nulo (8 bytes)
+    # 4-5) Cifrar leyendo y escribiendo con mmap (sin cargar el archivo en memoria)
+    des_encrypt_file_mmap(key, im, args.enc_out, args.chunk_size)
+    print(f"Archivo cifrado guardado como: {args.enc_out}")
 
-    cipher = des(key_bytes, CBC, iv_bytes, pad=None, padmode=PAD_PKCS5)
+    with mmap_io.map_input(args.enc_out) as data_encrypted, ExitStack() as stack:
+        # 6) Base64 por trozos sobre un memoryview del cifrado (sin construir un str gigante)
+        sinks = []
+        if not args.no_print_b64:
+            print("Mensaje cifrado en Base64:", flush=True)
+            sinks.append(sys.stdout.buffer)
+        if args.save_b64:
+            b64_file = stack.enter_context(open(args.save_b64, "w+b"))
+        else:
+            b64_file = stack.enter_context(tempfile.TemporaryFile())
+        sinks.append(b64_file)
+        b64stream.encode_buffer(data_encrypted, sinks)
+        if not args.no_print_b64:
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.flush()
+        if args.save_b64:
+            print(f"(Guardado Base64 en: {args.save_b64})")
 
-    # 5) Cifrar
-    data_encrypted = cipher.encrypt(image_bytes)
+        # 7-9) Simular recibir el Base64: se decodifica por trozos y cada trozo se descifra
+        #      y se escribe en la imagen sin juntar el cifrado ni el texto plano en memoria
+        #      (con --workers > 1 los bloques CBC de cada trozo se descifran en paralelo).
+        #      Se escribe en un temporal que solo se renombra si todo salió bien, así un
+        #      error de relleno o de Base64 no deja texto plano parcial.
+        b64_file.seek(0)
+        out_name = f"decrypted_image.{ext if ext else 'bin'}"
+        try:
+            with stream_io.replace_on_success(out_name) as out:
+                des_decrypt_stream(key, b64stream.decoding_reader(b64_file), out, args.chunk_size, args.workers)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
 
-    # 6) Mostrar en Base64
-    b64 = base64.b64encode(data_encrypted).decode("ascii")
-    print("Mensaje cifrado en Base64:")
-    print(b64)
+    print(f"\nImagen descifrada guardada como: {out_name}")
 
-    # 7) (Opcional) simular recibir Base64 y decodificar
-    not_b64 = base64.b64decode(b64)
+    # 10) Mostrar imagen con skimage + matplotlib si es realmente imagen
+    if not args.no_show:
+        try:
+            preview.show_images([(f"Vista previa: {out_name}", out_name)])
+        except Exception as e:
+            print(f"Nota: No se pudo mostrar como imagen (¿quizá no es un formato de imagen válido?). Detalle: {e}")
 
-    # 8) Descifrar
-    data_decrypted = cipher.decrypt(not_b64)
 
-    # 9) Guardar imagen descifrada
-    out_name = f"decrypted_image.{ext if ext else 'bin'}"
-    with open(out_name, "wb") as out:
-        out.write(data_decrypted)
+def main():
+    args = parse_args()
+    out = sys.stdout if args.action == "demo" else sys.stderr
 
-    print(f"\nImagen descifrada guardada como: {out_name}")
+    if args.chunk_size <= 0 or args.chunk_size % BLOCK_SIZE != 0:
+        print("ERROR: --chunk-size debe ser un múltiplo positivo de 8.", file=out)
+        sys.exit(1)
+    if args.workers < 1:
+        print("ERROR: --workers debe ser al menos 1.", file=out)
+        sys.exit(1)
 
-    # 10) Mostrar imagen con skimage + matplotlib si es realmente imagen
     try:
-        new_image = io.imread(out_name)
-        plt.title(f"Vista previa: {out_name}")
-        plt.axis("off")
-        plt.imshow(new_image)
-        plt.show()
-    except Exception as e:
-        print(f"Nota: No se pudo mostrar como imagen (¿quizá no es un formato de imagen válido?). Detalle: {e}")
+        key, key_source = load_key(args)
+    except (OSError, ValueError) as e:
+        print(f"ERROR: {e}", file=out)
+        sys.exit(1)
+
+    if args.action == "demo":
+        run_demo(args, key, key_source)
+        return
+    if key is None:
+        print("ERROR: encrypt/decrypt necesitan una clave (--keyhex, --keyfile o --keyenv).", file=out)
+        sys.exit(1)
+    run_stream(args, key)
 
 if __name__ == "__main__":
     main()
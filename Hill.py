@@ -1,14 +1,58 @@
-import numpy as np
+import argparse
+import codecs
+import sys
+from contextlib import ExitStack
+from functools import lru_cache
 from math import gcd
 
+import numpy as np
+
+from comun import stream_io
+
 # --- FUNCIONES MATEMÁTICAS Y DE VALIDACIÓN ---
+# 26 = 2 * 13 no es primo, así que Z/26 no es un cuerpo: el determinante y la
+# inversa se calculan por eliminación de Gauss-Jordan en Z/2 y en Z/13 (que sí
+# lo son) y se combinan con el teorema chino del resto:
+#   x ≡ a (mod 2), x ≡ b (mod 13)  =>  x = (13*a + 14*b) mod 26
+
+def crt_26(a, b):
+    """Combina un valor módulo 2 y otro módulo 13 en uno módulo 26."""
+    return (13 * a + 14 * b) % 26
+
+def _eliminacion(matriz, p):
+    """
+    Gauss-Jordan sobre [matriz | I] módulo el primo p. Cada paso opera sobre
+    filas completas de NumPy. Devuelve (determinante mod p, inversa mod p o None).
+    """
+    n = len(matriz)
+    a = np.concatenate([np.asarray(matriz, dtype=np.int64) % p, np.eye(n, dtype=np.int64)], axis=1)
+    det = 1
+    for col in range(n):
+        filas = np.flatnonzero(a[col:, col]) + col
+        if len(filas) == 0:
+            return 0, None
+        piv = filas[0]
+        if piv != col:
+            a[[col, piv]] = a[[piv, col]]
+            det = -det
+        det = det * a[col, col] % p
+        a[col] = a[col] * pow(int(a[col, col]), -1, p) % p
+        factores = a[:, col].copy()
+        factores[col] = 0
+        a = (a - np.outer(factores, a[col])) % p
+    return det % p, a[:, n:]
 
 def determinante(matriz):
-    """Calcula el determinante de una matriz 2x2 bajo módulo 26."""
-    return (matriz[0][0] * matriz[1][1] - matriz[0][1] * matriz[1][0]) % 26
+    """Calcula el determinante de una matriz n x n bajo módulo 26."""
+    return crt_26(_eliminacion(matriz, 2)[0], _eliminacion(matriz, 13)[0])
+
+# Inversos módulo 26 precalculados (None si gcd(a, 26) != 1)
+INVERSOS_26 = tuple(next((i for i in range(1, 26) if a * i % 26 == 1), None) for a in range(26))
 
 def inverso_modular(a, m=26):
     """Encuentra el inverso modular de 'a' en módulo 'm'."""
+    if m == 26:
+        return INVERSOS_26[a % 26]
     a = a % m
     for i in range(1, m):
         if (a * i) % m == 1:
@@ -20,80 +64,185 @@ def verificar_inversa(matriz):
     det = determinante(matriz)
     return gcd(det, 26) == 1
 
+@lru_cache(maxsize=128)
+def _inversa_cacheada(clave):
+    _, inv2 = _eliminacion(clave, 2)
+    _, inv13 = _eliminacion(clave, 13)
+    if inv2 is None or inv13 is None:
+        raise ValueError("La matriz clave no tiene inversa módulo 26 (determinante no coprimo con 26).")
+    inversa = crt_26(inv2, inv13)
+    inversa.setflags(write=False)  # la comparten todas las llamadas con la misma clave
+    return inversa
+
+def matriz_inversa(clave):
+    """Inversa modular (mod 26) de la clave n x n; se calcula una sola vez por clave."""
+    return _inversa_cacheada(tuple(map(tuple, np.asarray(clave).tolist())))
+
 # --- FUNCIONES DE CIFRADO Y DESCIFRADO ---
+# Todo el trabajo es en bytes y arreglos uint8, sin Python por carácter:
+#   texto -> bytes.translate con una tabla de 256 entradas (quita espacios y saltos
+#   de línea, pasa a minúsculas y resta 'a', módulo 26) -> np.frombuffer (uint8)
+#   -> producto por la clave en el acumulador más pequeño que no desborda
+#   -> % 26 en el mismo arreglo -> tabla de 26 letras -> tobytes()
+# Cualquier byte x vale (x - ord('a')) mod 26, igual que ord(c) - ord('a') en la
+# versión original (el producto se reduce módulo 26 de todos modos).
+
+_LETRAS = np.frombuffer(b"abcdefghijklmnopqrstuvwxyz", dtype=np.uint8)
+_A_NUMERO = bytes(((b + 32 if 65 <= b <= 90 else b) - ord('a')) % 26 for b in range(256))  # A-Z como a-z
+_RELLENO = ord('x') - ord('a')
+_BLANCOS = " \t\r\n"  # se ignoran como los espacios (p. ej. el salto de línea final de un archivo)
+_SIN_BLANCOS = str.maketrans("", "", _BLANCOS)
+
+def dtype_acumulador(n):
+    """
+    Tipo entero más pequeño para los productos de una clave n x n: cada elemento
+    del resultado suma n productos de dos valores 0..25, o sea como máximo n * 625.
+    """
+    return np.uint16 if n * 25 * 25 < 2 ** 16 else np.uint32
+
+def texto_a_numeros(mensaje):
+    """Texto (str o bytes) -> arreglo uint8 de valores 0..25, sin espacios ni saltos de línea."""
+    if isinstance(mensaje, str):
+        mensaje = mensaje.lower().translate(_SIN_BLANCOS)
+        if not mensaje.isascii():
+            # fuera de ASCII se usa el punto de código, como ord() en la versión original
+            puntos = np.frombuffer(mensaje.encode("utf-32-le"), dtype=np.uint32)
+            return ((puntos + 7) % 26).astype(np.uint8)  # (c - 97) mod 26 sin negativos
+        mensaje = mensaje.encode("ascii")
+    return np.frombuffer(bytes(mensaje).translate(_A_NUMERO, _BLANCOS.encode()), dtype=np.uint8)
+
+def _hill_numeros(numeros, matriz):
+    """Aplica `matriz` (n x n, ya mod 26) a los bloques de `numeros` y devuelve las letras en bytes."""
+    n = len(matriz)
+    acumulador = dtype_acumulador(n)
+    # (L/n, n) @ K^T == (K @ (n, L/n))^T: el resultado queda ya en orden de lectura
+    bloques = numeros.reshape(-1, n)
+    resultado = np.dot(bloques.astype(acumulador), matriz.T.astype(acumulador))
+    np.remainder(resultado, 26, out=resultado)
+    return _LETRAS.take(resultado).tobytes()
+
+def hill_cifrado_bytes(datos, clave):
+    """Cifra `datos` (bytes) con una clave n x n y devuelve el cifrado en bytes (a-z)."""
+    clave = np.asarray(clave) % 26
+    n = len(clave)
+    numeros = texto_a_numeros(datos)
+    if len(numeros) % n != 0:
+        numeros = np.concatenate([numeros, np.full(n - len(numeros) % n, _RELLENO, dtype=np.uint8)])
+    return _hill_numeros(numeros, clave)
+
+def hill_descifrado_bytes(datos, clave):
+    """Descifra `datos` (bytes) con una clave n x n y devuelve el texto en bytes (a-z)."""
+    return _hill_numeros(texto_a_numeros(datos), matriz_inversa(clave))
 
 def hill_cifrado(mensaje, clave):
-    """Cifra un mensaje usando el algoritmo de Hill con una clave 2x2."""
-    mensaje = mensaje.lower().replace(" ", "")
-    if len(mensaje) % 2 != 0:
-        mensaje += 'x'
-    
-    mensaje_numeros = [ord(caracter) - ord('a') for caracter in mensaje]
-    mensaje_matriz = np.array(mensaje_numeros).reshape(-1, 2).T
-    
-    cifrado_matriz = np.dot(clave, mensaje_matriz) % 26
-    
-    texto_cifrado = ''.join(chr(num + ord('a')) for num in cifrado_matriz.T.flatten())
-    
-    return texto_cifrado
+    """Cifra un mensaje usando el algoritmo de Hill con una clave n x n."""
+    return hill_cifrado_bytes(mensaje, clave).decode("ascii")
 
 def hill_descifrado(mensaje_cifrado, clave):
-    """Descifra un mensaje usando el algoritmo de Hill con una clave 2x2."""
-    det = determinante(clave)
-    inv_det = inverso_modular(det)
-    adjunta = np.array([[clave[1][1], -clave[0][1]], [-clave[1][0], clave[0][0]]])
-    clave_inversa = (inv_det * adjunta) % 26
-    
-    mensaje_cifrado = mensaje_cifrado.lower().replace(" ", "")
-    mensaje_numeros = [ord(caracter) - ord('a') for caracter in mensaje_cifrado]
-    mensaje_matriz = np.array(mensaje_numeros).reshape(-1, 2).T
-    
-    descifrado_matriz = np.dot(clave_inversa, mensaje_matriz) % 26
-    
-   
-    texto_descifrado = ''.join(chr(int(round(num)) + ord('a')) for num in descifrado_matriz.T.flatten())
-    
-    return texto_descifrado
+    """Descifra un mensaje usando el algoritmo de Hill con una clave n x n."""
+    return hill_descifrado_bytes(mensaje_cifrado, clave).decode("ascii")
+
+# --- CIFRADO POR TROZOS (STREAMING) ---
+# El texto llega en trozos de cualquier tamaño. De cada trozo se cifran solo los
+# bloques completos de n letras; las que sobran (menos de n) pasan al trozo
+# siguiente, y el relleno con 'x' se añade una sola vez, al final. Como los
+# bloques son independientes, la salida es idéntica a la de hill_cifrado_bytes
+# (o hill_cifrado, si los trozos son str) sobre el texto completo.
+
+CHUNK_SIZE = 1 << 20
+
+def _hill_trozos(trozos, matriz, rellenar):
+    n = len(matriz)
+    resto = np.empty(0, dtype=np.uint8)
+    for trozo in trozos:
+        numeros = texto_a_numeros(trozo)
+        if len(resto):
+            numeros = np.concatenate([resto, numeros])
+        completos = len(numeros) // n * n
+        resto = numeros[completos:].copy()
+        if completos:
+            yield _hill_numeros(numeros[:completos], matriz)
+    if len(resto):
+        if not rellenar:
+            raise ValueError(f"El texto cifrado no tiene un número de letras múltiplo de {n}.")
+        relleno = np.full(n - len(resto), _RELLENO, dtype=np.uint8)
+        yield _hill_numeros(np.concatenate([resto, relleno]), matriz)
+
+def hill_cifrado_trozos(trozos, clave):
+    """Cifra un iterable de trozos (str o bytes) y va devolviendo el cifrado en bytes."""
+    return _hill_trozos(trozos, np.asarray(clave) % 26, rellenar=True)
+
+def hill_descifrado_trozos(trozos, clave):
+    """Descifra un iterable de trozos (str o bytes) y va devolviendo el texto en bytes."""
+    return _hill_trozos(trozos, matriz_inversa(clave), rellenar=False)
+
+def _trozos_utf8(src, chunk_size):
+    """Lee `src` (binario) por trozos y los devuelve como str; un carácter partido entre dos trozos no se rompe."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for trozo in iter(lambda: src.read(chunk_size), b""):
+        yield decoder.decode(trozo)
+    yield decoder.decode(b"", final=True)
+
+def hill_stream(src, dst, clave, descifrar=False, chunk_size=CHUNK_SIZE):
+    """
+    Lee `src` (binario, UTF-8) en trozos de chunk_size bytes y escribe el resultado
+    en `dst`; igual que hill_cifrado/hill_descifrado sobre el texto completo.
+    """
+    trozos = _trozos_utf8(src, chunk_size)
+    procesar = hill_descifrado_trozos if descifrar else hill_cifrado_trozos
+    for salida in procesar(trozos, clave):
+        dst.write(salida)
 
 # --- FUNCIÓN PRINCIPAL ---
 
+def leer_clave(texto):
+    """Clave escrita como filas separadas por ';' y valores por ',' (ej. "6,24,1;13,16,10;20,17,15")."""
+    filas = [[int(v) for v in fila.split(",")] for fila in texto.split(";")]
+    if any(len(fila) != len(filas) for fila in filas):
+        raise ValueError("La clave debe ser una matriz cuadrada (n filas de n números).")
+    return np.array(filas)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Cifrado de Hill con una clave n x n, por trozos.")
+    parser.add_argument("accion", choices=("cifrar", "descifrar"), help="cifrar o descifrar --input.")
+    parser.add_argument(
+        "--clave",
+        "-k",
+        required=True,
+        help='Matriz clave: filas separadas por ";" y valores por "," (ej. "6,24,1;13,16,10;20,17,15").',
+    )
+    parser.add_argument("--input", "-i", default="-", help="Archivo de entrada; '-' = stdin (por defecto).")
+    parser.add_argument("--output", "-o", default="-", help="Archivo de salida; '-' = stdout (por defecto).")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=CHUNK_SIZE,
+        help=f"Bytes por trozo (por defecto: {CHUNK_SIZE}).",
+    )
+    return parser.parse_args()
+
 def main():
-    """Función principal que maneja la interacción con el usuario."""
-    print("--- Cifrado de Hill (Matriz 2x2) ---")
-    print("Primero, ingrese los 4 números de la matriz clave:")
-    
+    """Cifra o descifra un archivo (o stdin) por trozos y escribe el resultado."""
+    args = parse_args()
     try:
-        k11 = int(input("Valor de la fila 1, columna 1: "))
-        k12 = int(input("Valor de la fila 1, columna 2: "))
-        k21 = int(input("Valor de la fila 2, columna 1: "))
-        k22 = int(input("Valor de la fila 2, columna 2: "))
-        
-        clave = np.array([[k11, k12], [k21, k22]])
-    except ValueError:
-        print("\nError: Ingrese solo números enteros para la clave.")
-        return
-
+        clave = leer_clave(args.clave)
+    except ValueError as e:
+        print(f"Error: clave no válida: {e}", file=sys.stderr)
+        sys.exit(1)
     if not verificar_inversa(clave):
-        print(f"\nError: La matriz de clave {clave.tolist()} no es válida.")
-        print("Su determinante no es coprimo con 26 y no tiene inversa modular.")
-        return
-    
-    print(f"\nMatriz de clave válida: {clave.tolist()}")
-
-    opcion = input("Ingrese 'c' para cifrar o 'd' para descifrar: ").lower()
-    
-    if opcion == 'c':
-        mensaje = input("Ingrese el mensaje a cifrar: ")
-        mensaje_cifrado = hill_cifrado(mensaje, clave)
-        print("\nMensaje cifrado:", mensaje_cifrado)
-    
-    elif opcion == 'd':
-        mensaje_cifrado = input("Ingrese el mensaje a descifrar: ")
-        mensaje_descifrado = hill_descifrado(mensaje_cifrado, clave)
-        print("\nMensaje descifrado:", mensaje_descifrado)
-    
-    else:
-        print("Opción no válida. Por favor, reinicie el programa.")
+        print(f"Error: La matriz de clave {clave.tolist()} no es válida.", file=sys.stderr)
+        print("Su determinante no es coprimo con 26 y no tiene inversa modular.", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        with ExitStack() as stack:
+            src = stream_io.open_binary(args.input, "rb", stack)
+            dst = stream_io.open_binary(args.output, "wb", stack)
+            hill_stream(src, dst, clave, args.accion == "descifrar", args.chunk_size)
+            dst.flush()
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
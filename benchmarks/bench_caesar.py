@@ -0,0 +1,82 @@
+# Benchmark del cifrado César (Caesar.py de la raíz).
+#
+# Compara el bucle original (dos búsquedas en diccionario y un append por letra)
+# con las tablas de traducción (bytes.translate, también para str) y la variante
+# NumPy, sobre un texto de varios MB. Comprueba además que todas coinciden.
+#
+# Uso: python benchmarks/bench_caesar.py [--size BYTES] [--shift K]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Caesar import ALFABETO, caesar_encrypt, caesar_encrypt_np  # noqa: E402
+
+dicc = {letra: i for i, letra in enumerate(ALFABETO)}
+inv = {i: letra for letra, i in dicc.items()}
+
+
+def caesar_loop(message: str, k: int) -> str:
+    """Versión original de Caesar.py, como referencia."""
+    resultado = []
+    for letter in message:
+        if letter not in dicc:
+            resultado.append(letter)
+            continue
+        resultado.append(inv[(dicc[letter] + k) % 26])
+    return "".join(resultado)
+
+
+def corpus(size: int) -> str:
+    """Texto pseudoaleatorio con letras, espacios, signos y algún carácter no ASCII."""
+    rng = random.Random(1234)
+    words = ["".join(rng.choice(ALFABETO) for _ in range(rng.randint(1, 9))) for _ in range(2000)]
+    words += ["niño", "Canción", "¿qué?", "AÑO", "3.14", "¡hola!"]
+    parts, total = [], 0
+    while total < size:
+        w = rng.choice(words)
+        parts.append(w)
+        total += len(w) + 1
+    return " ".join(parts)[:size]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rendimiento del cifrado César.")
+    parser.add_argument("--size", type=int, default=8 * 1024 * 1024, help="Caracteres del texto de prueba.")
+    parser.add_argument("--shift", type=int, default=3, help="Desplazamiento k.")
+    args = parser.parse_args()
+
+    text = corpus(args.size)
+    data = text.encode("utf-8")
+    mb = len(data) / 1e6
+
+    expected, t_loop = timed(caesar_loop, text, args.shift)
+    got_str, t_str = timed(caesar_encrypt, text, args.shift)
+    got_bytes, t_bytes = timed(caesar_encrypt, data, args.shift)
+    caesar_encrypt_np(data[:16], args.shift)  # importar NumPy fuera de la medición
+    got_np, t_np = timed(caesar_encrypt_np, data, args.shift)
+
+    assert got_str == expected
+    assert got_bytes == expected.encode("utf-8")
+    assert got_np.tobytes() == got_bytes
+
+    print(f"Texto: {len(text)} caracteres ({mb:.1f} MB en UTF-8), k = {args.shift}\n")
+    for name, t in [("bucle original", t_loop), ("str (traducida)", t_str),
+                    ("bytes.translate", t_bytes), ("NumPy (uint8)", t_np)]:
+        t = max(t, 1e-9)
+        print(f"  {name:<16} {mb / t:10.1f} MB/s  x{t_loop / t:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
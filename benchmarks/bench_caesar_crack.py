@@ -0,0 +1,79 @@
+# Benchmark del criptoanálisis César por chi-cuadrado (Caesar.py de la raíz).
+#
+# Genera N cifrados con claves aleatorias (textos muestreados con las
+# frecuencias del idioma) y mide cuántos se rompen por segundo con:
+#   - fuerza bruta ingenua: descifrar las 26 claves y contar letras en cada una,
+#   - crack(): un histograma por texto y las 26 claves puntuadas a la vez,
+#   - crack_batch(): un único bincount para todo el lote.
+# También informa el porcentaje de claves acertadas.
+#
+# Uso: python benchmarks/bench_caesar_crack.py [--count N] [--length L] [--lang es|en]
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Caesar import ALFABETO, FRECUENCIAS, caesar_decrypt, caesar_encrypt, crack, crack_batch  # noqa: E402
+
+
+def naive_crack(text: str, lang: str) -> int:
+    """Prueba las 26 claves recorriendo el texto completo en cada una."""
+    freq = FRECUENCIAS[lang]
+    best, best_score = 0, float("inf")
+    for k in range(26):
+        counts = Counter(c for c in caesar_decrypt(text, k) if c in ALFABETO)
+        total = max(sum(counts.values()), 1)
+        score = sum((counts[c] - total * f / 100) ** 2 / (total * f / 100) for c, f in zip(ALFABETO, freq))
+        if score < best_score:
+            best, best_score = k, score
+    return best
+
+
+def sample_texts(count: int, length: int, lang: str, rng: np.random.Generator):
+    freq = np.asarray(FRECUENCIAS[lang]) / sum(FRECUENCIAS[lang])
+    letters = rng.choice(np.frombuffer(ALFABETO.encode(), dtype=np.uint8), size=(count, length), p=freq)
+    letters[rng.random((count, length)) < 0.15] = ord(" ")
+    return [row.tobytes().decode("ascii") for row in letters]
+
+
+def rate(fn, count: int):
+    start = time.perf_counter()
+    result = fn()
+    return result, count / max(time.perf_counter() - start, 1e-9)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rendimiento del criptoanálisis César.")
+    parser.add_argument("--count", type=int, default=5000, help="Número de cifrados.")
+    parser.add_argument("--length", type=int, default=200, help="Caracteres por cifrado.")
+    parser.add_argument("--lang", choices=sorted(FRECUENCIAS), default="es", help="Idioma de los textos.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1234)
+    keys = rng.integers(0, 26, size=args.count)
+    texts = [caesar_encrypt(t, int(k)) for t, k in zip(sample_texts(args.count, args.length, args.lang, rng), keys)]
+
+    naive_n = min(args.count, 200)
+    naive, naive_rate = rate(lambda: [naive_crack(t, args.lang) for t in texts[:naive_n]], naive_n)
+    single, single_rate = rate(lambda: [crack(t, args.lang, top=1)[0][0] for t in texts], args.count)
+    (batch, _), batch_rate = rate(lambda: crack_batch(texts, args.lang), args.count)
+
+    assert list(batch) == single, "crack y crack_batch no coinciden"
+
+    print(f"{args.count} cifrados de {args.length} caracteres ({args.lang})\n")
+    for name, speed, found, n in [("fuerza bruta ingenua", naive_rate, naive, naive_n),
+                                  ("crack()", single_rate, single, args.count),
+                                  ("crack_batch()", batch_rate, batch, args.count)]:
+        accuracy = 100.0 * np.mean(np.asarray(found) == keys[:n])
+        print(f"  {name:<22} {speed:12.0f} cifrados/s  aciertos {accuracy:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
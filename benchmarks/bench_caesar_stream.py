@@ -0,0 +1,68 @@
+# Benchmark del modo streaming de Caesar.py (caesar_stream) sobre un archivo grande.
+#
+# Crea un archivo de texto temporal de --size bytes (1 GiB por defecto; con
+# letras, signos y caracteres multibyte) o usa --file, lo cifra por trozos hacia
+# /dev/null y muestra MB/s y la memoria máxima del proceso, que debe quedar en
+# el orden del tamaño de trozo y no del archivo.
+#
+# Uso: python benchmarks/bench_caesar_stream.py [--size BYTES] [--file RUTA] [--chunk-size N] [--lower]
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Caesar import CHUNK_SIZE, caesar_stream  # noqa: E402
+
+SAMPLE = "El veloz murciélago hindú comía feliz cardillo y kiwi. ¿AÑO 2024? The quick brown fox! ".encode("utf-8")
+
+
+def make_file(path: str, size: int) -> None:
+    block = SAMPLE * (CHUNK_SIZE // len(SAMPLE) + 1)
+    with open(path, "wb") as f:
+        written = 0
+        while written < size:
+            piece = block[:size - written]
+            f.write(piece)
+            written += len(piece)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rendimiento de caesar_stream sobre un archivo grande.")
+    parser.add_argument("--size", type=int, default=1 << 30, help="Bytes del archivo temporal (por defecto 1 GiB).")
+    parser.add_argument("--file", help="Usar este archivo en vez de generar uno.")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Bytes por trozo.")
+    parser.add_argument("--lower", action="store_true", help="Medir también el modo --lower.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = os.path.join(tmp, "caesar_bench.txt")
+            make_file(path, args.size)
+        size = os.path.getsize(path)
+        print(f"Archivo: {size / 1e6:.0f} MB, trozo: {args.chunk_size} bytes\n")
+
+        modes = [("bytes (tabla)", False)] + ([("--lower (UTF-8)", True)] if args.lower else [])
+        for name, lower in modes:
+            with open(path, "rb") as src, open(os.devnull, "wb") as dst:
+                start = time.perf_counter()
+                caesar_stream(src, dst, 3, args.chunk_size, lower)
+                elapsed = max(time.perf_counter() - start, 1e-9)
+            print(f"  {name:<16} {size / 1e6 / elapsed:8.1f} MB/s  ({elapsed:.2f} s)")
+        print(f"\nMemoria máxima del proceso: {peak_rss_mb():.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Benchmark de la validación de claves de Hill en lote (hill_analisis.py).
+#
+# Compara, en claves/s, la comprobación clave a clave con Hill.verificar_inversa
+# contra los determinantes vectorizados de hill_analisis.claves_validas sobre
+# claves aleatorias n x n, y luego recorre --count claves 3 x 3 numeradas con
+# contar_claves_validas en un solo proceso y con un ProcessPoolExecutor.
+#
+# Uso: python benchmarks/bench_hill_claves.py [--keys N] [--count N] [--procesos P] [--lote N]
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import Hill  # noqa: E402
+import hill_analisis  # noqa: E402
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, max(time.perf_counter() - start, 1e-9)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Claves de Hill por segundo: una a una, en lote y en paralelo.")
+    parser.add_argument("--keys", type=int, default=1_000_000, help="Claves aleatorias por dimensión.")
+    parser.add_argument("--loop-keys", type=int, default=20_000, help="Claves para la versión una a una.")
+    parser.add_argument("--count", type=int, default=20_000_000, help="Claves 3 x 3 numeradas a recorrer.")
+    parser.add_argument("--inicio", type=int, default=26 ** 8,
+                        help="Primer índice (por defecto 26^8; antes todas tienen la primera fila nula).")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1, help="Procesos del pool.")
+    parser.add_argument("--lote", type=int, default=hill_analisis.LOTE, help="Claves por lote.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1234)
+    print("Claves aleatorias:\n")
+    for n in (2, 3, 4):
+        claves = rng.integers(0, 26, size=(args.keys, n, n), dtype=np.uint8)
+        esperado, t_loop = timed(lambda: [Hill.verificar_inversa(k) for k in claves[:args.loop_keys]])
+        mascara, t_lote = timed(hill_analisis.claves_validas, claves)
+        assert mascara[:args.loop_keys].tolist() == esperado, f"{n} x {n}: resultados distintos"
+        v_loop, v_lote = args.loop_keys / t_loop, args.keys / t_lote
+        print(f"  {n} x {n}: una a una {v_loop:12,.0f} claves/s   en lote {v_lote:14,.0f} claves/s   x{v_lote / v_loop:6.1f}")
+
+    print(f"\nRecorrido de {args.count:,} claves 3 x 3 numeradas (lotes de {args.lote}):\n")
+    uno, t_uno = timed(hill_analisis.contar_claves_validas, 3, args.inicio, args.inicio + args.count, args.lote)
+    print(f"  1 proceso   {args.count / t_uno:14,.0f} claves/s  ({uno} válidas)")
+    varios, t_varios = timed(hill_analisis.contar_claves_validas, 3, args.inicio, args.inicio + args.count,
+                                 args.lote, args.procesos)
+    assert varios == uno
+    print(f"  {args.procesos} procesos {args.count / t_varios:14,.0f} claves/s  x{t_uno / t_varios:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Benchmark de arranque de los CLI de AES y DES con `python -X importtime`.
+#
+# Compara el tiempo de importar cada módulo contra la línea base de la versión
+# anterior (que importaba matplotlib.pyplot y skimage.io al cargar el módulo)
+# y falla si el camino de cifrado vuelve a cargar librerías de gráficos (o, en
+# AES, NumPy, que solo hace falta con --engine numpy).
+#
+# Uso: python benchmarks/bench_startup.py [--repeat N]
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que nunca deben aparecer al importar los CLI.
+FORBIDDEN = ("matplotlib", "skimage")
+
+# (nombre, carpeta a añadir a sys.path, módulo, módulos prohibidos)
+# AES solo carga NumPy con --engine numpy o al descifrar CBC; DES lo necesita siempre (des_fast).
+TARGETS = [
+    ("AES", os.path.join(ROOT, "AES"), "AES", FORBIDDEN + ("numpy",)),
+    ("DES", os.path.join(ROOT, "DES"), "DES", FORBIDDEN),
+]
+
+# Lo que importaban AES.py y DES.py al cargarse antes de los imports diferidos.
+BASELINE = "import matplotlib.pyplot, skimage.io"
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def importtime(code: str, path: str = ROOT):
+    """
+    Ejecuta `code` en un intérprete nuevo con -X importtime y devuelve
+    (microsegundos acumulados de los imports de nivel superior, módulos importados).
+    """
+    env = dict(os.environ, PYTHONPATH=path + os.pathsep + ROOT, MPLBACKEND="Agg")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env, capture_output=True, text=True, check=True,
+    )
+    total = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), m.group(3), m.group(4)
+        modules.add(name.split(".")[0])
+        if len(indent) == 1:  # import de nivel superior
+            total += cumulative
+    return total, modules
+
+
+def best_of(code: str, path: str, repeat: int):
+    runs = [importtime(code, path) for _ in range(repeat)]
+    return min(t for t, _ in runs), runs[0][1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de arranque de los CLI de AES/DES")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones (se toma el mínimo)")
+    args = parser.parse_args()
+
+    failed = False
+    try:
+        baseline, _ = best_of(BASELINE, ROOT, args.repeat)
+        print(f"{'línea base (matplotlib + skimage)':<36} {baseline / 1000:8.1f} ms")
+    except subprocess.CalledProcessError:
+        baseline = None
+        print("línea base no disponible (matplotlib/skimage no instalados)")
+
+    for label, path, module, forbidden in TARGETS:
+        elapsed, modules = best_of(f"import {module}", path, args.repeat)
+        print(f"{'import ' + label:<36} {elapsed / 1000:8.1f} ms")
+        loaded = sorted(m for m in forbidden if m in modules)
+        if loaded:
+            failed = True
+            print(f"  REGRESIÓN: {label} importa {', '.join(loaded)} al arrancar")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Benchmark of vigenere.py (repository root): the original per-letter loops
+# against the NumPy versions, and the original normalize_letters against the
+# table-driven one, and a per-letter autokey decryption loop against the
+# block-wise cumsum decoder, on a multi-MB text.
+#
+# Usage: python benchmarks/bench_vigenere.py [--size CHARS] [--key KEY]
+
+import argparse
+import os
+import random
+import sys
+import time
+import unicodedata
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import vigenere  # noqa: E402
+
+
+def corpus(size: int) -> str:
+    rng = random.Random(1234)
+    words = ["attack", "at", "dawn", "canción", "niño", "ÁRBOL", "über", "the", "quick", "¿qué?", "3.14", "fox!"]
+    parts, total = [], 0
+    while total < size:
+        w = rng.choice(words)
+        parts.append(w)
+        total += len(w) + 1
+    return " ".join(parts)[:size]
+
+
+def reference_normalize(s: str) -> str:
+    """The original normalize_letters (NFD + category check on every character)."""
+    s = "".join(ch for ch in unicodedata.normalize("NFD", s) if unicodedata.category(ch) != "Mn").upper()
+    return "".join(ch for ch in s if ch.isalpha())
+
+
+def autokey_decrypt_loop(ciphertext: str, key: str) -> str:
+    """Autokey decryption one letter at a time: each plaintext letter extends the keystream."""
+    keystream = list(vigenere.normalize_letters(key))
+    out = []
+    for i, c in enumerate(ciphertext):
+        p = vigenere.I2A[(vigenere.A2I[c] - vigenere.A2I[keystream[i]]) % 26]
+        out.append(p)
+        keystream.append(p)
+    return "".join(out)
+
+
+def numpy_core(letters: str, key) -> str:
+    return vigenere.array_to_letters(vigenere._shift_by_key(vigenere.letters_to_array(letters), key))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, max(time.perf_counter() - start, 1e-9)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vigenère throughput: loops vs NumPy.")
+    parser.add_argument("--size", type=int, default=4 * 1024 * 1024, help="Characters of test text.")
+    parser.add_argument("--key", default="Criptografía", help="Key.")
+    args = parser.parse_args()
+
+    text = corpus(args.size)
+    letters, t_ref = timed(reference_normalize, text)
+    got, t_norm = timed(vigenere.normalize_letters, text)
+    assert got == letters, "normalize_letters differs from the original"
+    mb = len(letters) / 1e6
+    print(f"Text: {len(text)} chars, {len(letters)} letters after normalization\n")
+
+    rows = [("normalize (original)", t_ref, t_ref), ("normalize (tables)", t_norm, t_ref)]
+    for name, loop, vec in [("encrypt", vigenere.vigenere_encrypt, vigenere.vigenere_encrypt_np),
+                            ("decrypt", vigenere.vigenere_decrypt, vigenere.vigenere_decrypt_np)]:
+        # on already-normalized letters, so normalization cost doesn't hide the core
+        expected, t_loop = timed(loop, letters, args.key)
+        got, t_vec = timed(vec, letters, args.key)
+        assert got == expected, f"{name}: NumPy output differs"
+        rows.append((f"{name} (loop)", t_loop, t_loop))
+        rows.append((f"{name} (NumPy)", t_vec, t_loop))
+        # the vectorized core alone, without the normalize_letters pass inside both functions
+        key = vigenere._key_array(args.key)
+        got, t_core = timed(numpy_core, letters, key if name == "encrypt" else -key)
+        assert got == expected
+        rows.append((f"{name} (NumPy core)", t_core, t_loop))
+
+    cipher = vigenere.autokey_encrypt(letters, args.key)
+    expected, t_loop = timed(autokey_decrypt_loop, cipher, args.key)
+    got, t_vec = timed(vigenere.autokey_decrypt, cipher, args.key)
+    assert got == expected, "autokey: NumPy output differs"
+    rows += [("autokey dec (loop)", t_loop, t_loop), ("autokey dec (NumPy)", t_vec, t_loop)]
+
+    for name, t, base in rows:
+        print(f"  {name:<22} {t * 1e3:9.1f} ms  {mb / t:8.1f} MB/s  x{base / t:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
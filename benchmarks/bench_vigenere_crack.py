@@ -0,0 +1,88 @@
+# Benchmark of the Vigenère cracker in vigenere.py (repository root).
+#
+# Encrypts a ~1 MB text (letters sampled with the language frequencies) with
+# random keys of several lengths and times crack() with periods up to
+# --max-period, against a naive version that, for every candidate period,
+# slices the columns into strings and counts letters with Counter (run on the
+# first --naive-size letters only, since it is much slower).
+#
+# Usage: python benchmarks/bench_vigenere_crack.py [--size LETTERS] [--max-period P] [--lang en|es] [--naive-size N]
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import vigenere  # noqa: E402
+from vigenere import ALPHABET, FRECUENCIAS  # noqa: E402
+
+
+def naive_crack(ciphertext: str, max_period: int, lang: str):
+    """Per-period IoC over string columns, then 26 trial decryptions per column."""
+    C = vigenere.normalize_letters(ciphertext)
+    freq = [f / 100 for f in FRECUENCIAS[lang]]
+    best_ioc = 0.0
+    iocs = {}
+    for p in range(1, max_period + 1):
+        total = 0.0
+        for j in range(p):
+            col = C[j::p]
+            n = len(col)
+            total += sum(c * (c - 1) for c in Counter(col).values()) / max(n * (n - 1), 1)
+        iocs[p] = total / p
+        best_ioc = max(best_ioc, iocs[p])
+    best_p = min(p for p, v in iocs.items() if v >= 0.9 * best_ioc)
+    key = []
+    for j in range(best_p):
+        col = C[j::best_p]
+        scores = []
+        for k in range(26):
+            counts = Counter(ALPHABET[(ALPHABET.index(c) - k) % 26] for c in col)
+            scores.append(sum((counts[a] - len(col) * f) ** 2 / (len(col) * f) for a, f in zip(ALPHABET, freq)))
+        key.append(ALPHABET[int(np.argmin(scores))])
+    return "".join(key)
+
+
+def sample_text(size: int, lang: str, rng: np.random.Generator) -> str:
+    freq = np.asarray(FRECUENCIAS[lang]) / sum(FRECUENCIAS[lang])
+    return rng.choice(np.frombuffer(ALPHABET.encode(), dtype=np.uint8), size=size, p=freq).tobytes().decode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vigenère cracking speed: vectorized vs naive.")
+    parser.add_argument("--size", type=int, default=1_000_000, help="Letters of ciphertext.")
+    parser.add_argument("--max-period", type=int, default=100, help="Longest key length tried.")
+    parser.add_argument("--lang", choices=sorted(FRECUENCIAS), default="en", help="Plaintext language.")
+    parser.add_argument("--naive-size", type=int, default=100_000, help="Letters given to the naive version.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1234)
+    plain = sample_text(args.size, args.lang, rng)
+    print(f"{args.size} letters, periods up to {args.max_period} ({args.lang})\n")
+    for length in (3, 7, 16, 41, 97):
+        if length > args.max_period:
+            continue
+        key = "".join(rng.choice(list(ALPHABET), size=length))
+        cipher = vigenere.vigenere_encrypt_np(plain, key)
+
+        start = time.perf_counter()
+        found, _ = vigenere.crack(cipher, args.max_period, args.lang)
+        t_fast = time.perf_counter() - start
+
+        start = time.perf_counter()
+        naive = naive_crack(cipher[:args.naive_size], args.max_period, args.lang)
+        t_naive = time.perf_counter() - start
+
+        status = "ok" if found == key else f"WRONG ({found})"
+        print(f"  key length {length:3d}: crack() {t_fast * 1e3:7.1f} ms [{status}]   "
+              f"naive on {args.naive_size} letters {t_naive * 1e3:8.1f} ms [{'ok' if naive == key else 'wrong'}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Utilidades compartidas por los programas de AES/ y DES/ y por los CLI de la raíz
+# (Caesar.py, Hill.py, vigenere.py).
@@ -0,0 +1,120 @@
+# Base64 por bloques para los programas de AES y DES.
+# En vez de codificar todo el cifrado en un único `str` (varias copias completas
+# en memoria), se codifica en trozos alineados a 3 bytes (-> 4 caracteres) y se
+# decodifica en trozos alineados a 4 caracteres, escribiendo cada trozo apenas
+# está listo en un archivo, una tubería o la consola.
+
+import binascii
+from io import BufferedReader, RawIOBase
+from typing import BinaryIO, Iterable, Iterator, Sequence
+
+from .stream_io import check_chunk_size
+
+# Bytes crudos por trozo (múltiplo de 3): 768 KiB -> 1 MiB de Base64.
+CHUNK_SIZE = 3 * 256 * 1024
+
+# Caracteres que se ignoran al decodificar (saltos de línea, espacios).
+_WHITESPACE = b" \t\r\n"
+
+
+def encode_iter(data, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Codifica `data` (bytes, bytearray, mmap...) trozo a trozo. Los cortes se hacen
+    sobre un memoryview, así que no se copia el buffer original.
+    """
+    check_chunk_size(chunk_size, 3)
+    view = memoryview(data).cast("B")
+    for start in range(0, len(view), chunk_size):
+        yield binascii.b2a_base64(view[start:start + chunk_size], newline=False)
+
+
+def encode_buffer(data, sinks: Sequence[BinaryIO], chunk_size: int = CHUNK_SIZE) -> int:
+    """Codifica `data` y escribe cada trozo en todos los `sinks`. Devuelve los caracteres escritos."""
+    total = 0
+    for piece in encode_iter(data, chunk_size):
+        for sink in sinks:
+            sink.write(piece)
+        total += len(piece)
+    return total
+
+
+def encode_stream(src: BinaryIO, sinks: Sequence[BinaryIO], chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Lee `src` en bloques de `chunk_size` bytes (reutilizando un único buffer) y
+    escribe el Base64 de cada bloque en todos los `sinks`.
+    Devuelve el número de caracteres Base64 escritos.
+    """
+    check_chunk_size(chunk_size, 3)
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    fill = 0
+    total = 0
+    while True:
+        n = src.readinto(view[fill:])
+        if n:
+            fill += n
+            if fill < chunk_size:
+                continue
+        # Buffer lleno (múltiplo de 3) o fin de archivo: codificar lo acumulado.
+        if fill:
+            total += encode_buffer(view[:fill], sinks, chunk_size)
+            fill = 0
+        if not n:
+            return total
+
+
+def decode_iter(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Decodifica una secuencia de trozos Base64 de cualquier tamaño. Los caracteres
+    que no completan un grupo de 4 se guardan para el trozo siguiente.
+    """
+    rest = b""
+    for chunk in chunks:
+        chunk = bytes(chunk).translate(None, _WHITESPACE)
+        if rest:
+            chunk = rest + chunk
+        cut = len(chunk) - len(chunk) % 4
+        if cut:
+            yield binascii.a2b_base64(chunk[:cut])
+        rest = chunk[cut:]
+    if rest:
+        raise ValueError("Base64 inválido: longitud no es múltiplo de 4.")
+
+
+def decode_stream(src: BinaryIO, dst: BinaryIO, chunk_size: int = CHUNK_SIZE) -> int:
+    """Decodifica `src` en trozos y escribe los bytes en `dst`. Devuelve los bytes escritos."""
+    check_chunk_size(chunk_size, 4)
+    total = 0
+    for piece in decode_iter(iter(lambda: src.read(chunk_size), b"")):
+        dst.write(piece)
+        total += len(piece)
+    return total
+
+
+class _DecodingRaw(RawIOBase):
+    def __init__(self, src: BinaryIO, chunk_size: int):
+        check_chunk_size(chunk_size, 4)
+        self._pieces = decode_iter(iter(lambda: src.read(chunk_size), b""))
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._pending:
+            piece = next(self._pieces, None)
+            if piece is None:
+                return 0
+            self._pending = memoryview(piece)
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+def decoding_reader(src: BinaryIO, chunk_size: int = CHUNK_SIZE) -> BufferedReader:
+    """
+    Envuelve un archivo Base64 en un objeto de lectura que entrega los bytes ya
+    decodificados, para encadenarlo directamente con un descifrado en streaming.
+    """
+    return BufferedReader(_DecodingRaw(src, chunk_size))
@@ -0,0 +1,52 @@
+# Descifrado CBC en paralelo, común a AES y DES.
+# Cifrar en CBC es secuencial (cada bloque depende del cifrado anterior), pero
+# descifrar no: P_i = D(C_i) xor C_{i-1}, y C_{i-1} ya se conoce. Por eso el
+# cifrado se reparte en tramos alineados a bloque, cada worker aplica D() a su
+# tramo de forma independiente (como en ECB) y al final se hace un único XOR
+# vectorizado contra el cifrado desplazado un bloque (IV || C[:-1]).
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Optional
+
+# Por debajo de este tamaño no compensa arrancar procesos.
+MIN_PARALLEL_BYTES = 1 << 18
+
+
+def xor_with_previous(decrypted: bytes, ciphertext, iv: bytes) -> bytes:
+    """P = D(C) xor (IV || C[:-block]) en un solo paso de NumPy."""
+    import numpy as np  # diferido: importar AES.py no debe cargar NumPy
+
+    block_size = len(iv)
+    d = np.frombuffer(decrypted, dtype=np.uint8)
+    prev = np.empty_like(d)
+    prev[:block_size] = np.frombuffer(iv, dtype=np.uint8)
+    prev[block_size:] = np.frombuffer(ciphertext, dtype=np.uint8)[:len(d) - block_size]
+    np.bitwise_xor(d, prev, out=prev)
+    return prev.tobytes()
+
+
+def cbc_decrypt(ecb_decrypt: Callable[[bytes], bytes], iv: bytes, ciphertext, workers: int = 1,
+                pool: Optional[Executor] = None) -> bytes:
+    """
+    Descifra `ciphertext` (CBC, sin quitar el relleno). `ecb_decrypt` aplica el
+    descifrado de bloque a un tramo completo; con `workers > 1` debe poder enviarse
+    a otro proceso (función de módulo o functools.partial de una).
+    El resultado es idéntico byte a byte al descifrado secuencial.
+    """
+    block_size = len(iv)
+    if len(ciphertext) % block_size != 0:
+        raise ValueError(f"El cifrado CBC debe medir un múltiplo de {block_size} bytes.")
+    if not len(ciphertext):
+        return b""
+    if workers <= 1 or len(ciphertext) < MIN_PARALLEL_BYTES:
+        return xor_with_previous(ecb_decrypt(bytes(ciphertext)), ciphertext, iv)
+
+    nblocks = len(ciphertext) // block_size
+    per_part = -(-nblocks // workers) * block_size
+    segments = [bytes(ciphertext[i:i + per_part]) for i in range(0, len(ciphertext), per_part)]
+    if pool is None:
+        with ProcessPoolExecutor(max_workers=workers) as own_pool:
+            decrypted = b"".join(own_pool.map(ecb_decrypt, segments))
+    else:
+        decrypted = b"".join(pool.map(ecb_decrypt, segments))
+    return xor_with_previous(decrypted, ciphertext, iv)
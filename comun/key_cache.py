@@ -0,0 +1,116 @@
+# Caché LRU de claves expandidas (key schedule) compartida por AES y DES.
+# Cifrar miles de mensajes pequeños con la misma clave no debería recalcular
+# las subclaves en cada mensaje: la primera vez se guarda el objeto/arreglo con
+# las subclaves y las siguientes se reutiliza.
+#
+# El límite de memoria se configura con `configure(...)` o con las variables
+# de entorno KEY_CACHE_MAXSIZE (entradas) y KEY_CACHE_MAX_BYTES (bytes).
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Tamaño estimado de una entrada cuando el valor no expone `nbytes`
+# (por ejemplo, objetos de pyaes o pyDes con listas de subclaves).
+DEFAULT_ENTRY_BYTES = 4096
+
+
+class KeyScheduleCache:
+    """
+    Caché LRU acotada por número de entradas y por bytes estimados.
+    La clave de la caché es la tupla (algoritmo, clave).
+    """
+
+    def __init__(self, maxsize: int = 256, max_bytes: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Tuple[str, Hashable], Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, algorithm: str, key: bytes, factory: Callable[[bytes], Any],
+            nbytes: Optional[int] = None) -> Any:
+        """
+        Devuelve las subclaves de (algorithm, key); si no están, las calcula con
+        `factory(key)` y las guarda. El valor devuelto se comparte: no modificarlo.
+        """
+        cache_key = (algorithm, bytes(key))
+        with self._lock:
+            entry = self._data.get(cache_key)
+            if entry is not None:
+                self._data.move_to_end(cache_key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = factory(bytes(key))
+        size = nbytes if nbytes is not None else getattr(value, "nbytes", DEFAULT_ENTRY_BYTES)
+        with self._lock:
+            if cache_key not in self._data and self.maxsize > 0:
+                self._data[cache_key] = (value, size)
+                self._bytes += size
+                self._evict()
+        return value
+
+    def _evict(self) -> None:
+        while self._data and (len(self._data) > self.maxsize or
+                              (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, size) = self._data.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def configure(self, maxsize: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Cambia los límites; las entradas sobrantes se descartan de inmediato."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "maxsize": self.maxsize,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+# Instancia única que usan AES/AES.py y DES/DES.py.
+cache = KeyScheduleCache(
+    maxsize=_env_int("KEY_CACHE_MAXSIZE") or 256,
+    max_bytes=_env_int("KEY_CACHE_MAX_BYTES"),
+)
+
+
+def get_schedule(algorithm: str, key: bytes, factory: Callable[[bytes], Any],
+                 nbytes: Optional[int] = None) -> Any:
+    return cache.get(algorithm, key, factory, nbytes)
+
+
+def configure(maxsize: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+    cache.configure(maxsize, max_bytes)
+
+
+def stats() -> Dict[str, Optional[int]]:
+    return cache.stats()
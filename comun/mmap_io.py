@@ -0,0 +1,57 @@
+# Entrada/salida con mmap para cifrar archivos grandes (imágenes de disco, etc.).
+# El origen se mapea en solo lectura y el destino se crea con su tamaño final y
+# se mapea en escritura, así los motores de cifrado leen y escriben directamente
+# sobre las páginas del sistema operativo a través de memoryview, sin copias
+# completas del archivo en el heap de Python.
+#
+# Nota: los memoryview derivados del mapa deben liberarse antes de salir del
+# bloque `with` (mmap no puede cerrarse mientras haya vistas exportadas).
+
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def _map_file(f, access: int) -> Iterator[memoryview]:
+    size = os.fstat(f.fileno()).st_size
+    if size == 0:
+        # mmap no admite archivos vacíos
+        yield memoryview(bytearray()) if access == mmap.ACCESS_WRITE else memoryview(b"")
+        return
+    mm = mmap.mmap(f.fileno(), size, access=access)
+    view = memoryview(mm)
+    try:
+        yield view
+    finally:
+        view.release()
+        if access == mmap.ACCESS_WRITE:
+            mm.flush()
+        mm.close()
+
+
+@contextmanager
+def map_input(path: str) -> Iterator[memoryview]:
+    """Mapea `path` en solo lectura y entrega un memoryview sobre su contenido."""
+    with open(path, "rb") as f, _map_file(f, mmap.ACCESS_READ) as view:
+        yield view
+
+
+@contextmanager
+def map_output(path: str, size: int) -> Iterator[memoryview]:
+    """
+    Crea (o trunca) `path` con exactamente `size` bytes, lo mapea en escritura y
+    entrega un memoryview escribible. Al salir se vuelcan las páginas a disco.
+    """
+    with open(path, "w+b") as f:
+        f.truncate(size)
+        with _map_file(f, mmap.ACCESS_WRITE) as view:
+            yield view
+
+
+@contextmanager
+def map_existing(path: str) -> Iterator[memoryview]:
+    """Mapea en escritura un archivo que ya tiene su tamaño final (p. ej. desde un worker)."""
+    with open(path, "r+b") as f, _map_file(f, mmap.ACCESS_WRITE) as view:
+        yield view
@@ -0,0 +1,22 @@
+# Vista previa de imágenes con matplotlib + skimage.
+# Los imports se hacen dentro de la función: cargar matplotlib cuesta casi un
+# segundo, y el cifrado/descifrado (o una ejecución con --no-show) no lo necesita.
+
+from typing import Sequence, Tuple
+
+
+def show_images(images: Sequence[Tuple[str, str]]) -> None:
+    """
+    Muestra cada imagen (título, ruta) en su propia figura. Lanza una excepción
+    si las librerías no están instaladas o el archivo no es una imagen válida.
+    """
+    import matplotlib.pyplot as plt
+    from skimage import io
+
+    loaded = [(title, io.imread(path)) for title, path in images]
+    for title, img in loaded:
+        plt.figure()
+        plt.title(title)
+        plt.axis("off")
+        plt.imshow(img)
+    plt.show()
@@ -0,0 +1,65 @@
+# Lectura y escritura por bloques, común a los programas de AES y DES (y a los
+# CLI de la raíz): lecturas completas desde tuberías, validación del tamaño de
+# trozo, quitar el relleno PKCS5/PKCS7, abrir '-' como stdin/stdout y escribir
+# el texto plano en un temporal que solo se renombra si todo salió bien.
+
+import os
+import sys
+from contextlib import ExitStack, contextmanager
+from typing import BinaryIO, Iterator
+
+
+def check_chunk_size(chunk_size: int, multiple: int) -> None:
+    """ValueError si `chunk_size` no es un múltiplo positivo de `multiple` (el tamaño de bloque)."""
+    if chunk_size <= 0 or chunk_size % multiple != 0:
+        raise ValueError(f"chunk_size debe ser un múltiplo positivo de {multiple}.")
+
+
+def read_exact(src: BinaryIO, n: int) -> bytes:
+    """Lee hasta `n` bytes aunque `src` (p. ej. una tubería) entregue lecturas parciales."""
+    parts = []
+    while n > 0:
+        part = src.read(n)
+        if not part:
+            break
+        parts.append(part)
+        n -= len(part)
+    return b"".join(parts)
+
+
+def pkcs_unpad(data: bytes, block_size: int, name: str = "PKCS7") -> bytes:
+    """Quita el relleno PKCS5/PKCS7 (`name` solo cambia el mensaje de error)."""
+    n = data[-1] if data else 0
+    if not 1 <= n <= block_size or data[-n:] != bytes([n]) * n:
+        raise ValueError(f"Relleno {name} inválido: clave incorrecta o datos dañados.")
+    return data[:-n]
+
+
+def open_binary(path: str, mode: str, stack: ExitStack) -> BinaryIO:
+    """Abre `path` en modo binario dentro de `stack`; '-' es stdin o stdout (que no se cierran)."""
+    if path == "-":
+        return sys.stdin.buffer if "r" in mode else sys.stdout.buffer
+    return stack.enter_context(open(path, mode))
+
+
+@contextmanager
+def staged_path(out_path: str) -> Iterator[str]:
+    """
+    Entrega la ruta de un temporal junto a `out_path` y solo lo renombra a `out_path`
+    si el bloque termina sin excepción: ante un fallo no queda salida parcial.
+    """
+    tmp_path = out_path + ".part"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@contextmanager
+def replace_on_success(out_path: str) -> Iterator[BinaryIO]:
+    """Como `staged_path`, pero entrega el temporal ya abierto en escritura binaria."""
+    with staged_path(out_path) as tmp_path:
+        with open(tmp_path, "wb") as dst:
+            yield dst
@@ -0,0 +1,181 @@
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Hill import INVERSOS_26, crt_26, hill_cifrado, leer_clave, texto_a_numeros
+
+# --- ATAQUE CON TEXTO PLANO CONOCIDO ---
+# Con bloques de n letras como filas, el cifrado de Hill es  C = P @ K^T (mod 26).
+# Se resuelve ese sistema lineal para K^T por Gauss-Jordan en Z/2 y en Z/13, usando
+# todos los bloques conocidos a la vez: la eliminación elige sola n bloques
+# linealmente independientes (no hace falta que los n primeros formen una matriz
+# invertible) y el resto sirve para comprobar que el par texto/cifrado es coherente.
+
+def _resolver_mod_primo(a, b, p):
+    """
+    Resuelve a @ x = b (mod p) con a de m x n (m >= n). Devuelve x (n x k) o None
+    si a no tiene rango n; ValueError si el sistema no tiene solución.
+    """
+    m, n = a.shape
+    aumentada = np.concatenate([a % p, b % p], axis=1).astype(np.int64)
+    for col in range(n):
+        filas = np.flatnonzero(aumentada[col:, col]) + col
+        if len(filas) == 0:
+            return None
+        piv = filas[0]
+        if piv != col:
+            aumentada[[col, piv]] = aumentada[[piv, col]]
+        aumentada[col] = aumentada[col] * pow(int(aumentada[col, col]), -1, p) % p
+        factores = aumentada[:, col].copy()
+        factores[col] = 0
+        aumentada = (aumentada - np.outer(factores, aumentada[col])) % p
+    if aumentada[n:, n:].any():
+        raise ValueError(f"El texto y el cifrado no corresponden a un cifrado de Hill {n} x {n}.")
+    return aumentada[:n, n:]
+
+def recuperar_clave(texto_plano, texto_cifrado, n):
+    """
+    Recupera la clave n x n a partir de un texto plano y su cifrado (str o bytes,
+    se ignoran espacios y mayúsculas como en Hill.py). Se usan los bloques completos
+    comunes a los dos textos; hacen falta al menos n bloques independientes.
+    """
+    plano = texto_a_numeros(texto_plano)
+    cifrado = texto_a_numeros(texto_cifrado)
+    largo = min(len(plano), len(cifrado)) // n * n
+    p = plano[:largo].reshape(-1, n).astype(np.int64)
+    c = cifrado[:largo].reshape(-1, n).astype(np.int64)
+    k2 = _resolver_mod_primo(p, c, 2)
+    k13 = _resolver_mod_primo(p, c, 13)
+    if k2 is None or k13 is None:
+        raise ValueError(
+            f"No hay {n} bloques de texto plano linealmente independientes módulo 26; "
+            "hace falta más texto conocido."
+        )
+    return crt_26(k2, k13).T
+
+# --- VALIDACIÓN DE CLAVES EN LOTE ---
+# Determinantes de N claves apiladas (N, n, n) a la vez, con eliminación gaussiana
+# vectorizada sobre el eje de las claves en Z/2 y Z/13 (enteros pequeños, sin
+# np.linalg ni coma flotante) y el teorema chino del resto. Cada paso es una
+# operación de NumPy sobre todo el lote; no hay Python por clave.
+
+_INVERSOS_MOD = {p: np.array([0] + [pow(a, -1, p) for a in range(1, p)], dtype=np.int16) for p in (2, 13)}
+# 1 si el determinante (mod 26) es coprimo con 26, a partir de la tabla de inversos
+_ES_UNIDAD = np.array([inv is not None for inv in INVERSOS_26])
+# 26^(n*n) claves posibles; con int64 se pueden numerar hasta n = 3
+_MAX_N_ENUMERABLE = 3
+LOTE = 1 << 20
+
+def determinantes_mod_primo(claves, p):
+    """Determinantes módulo el primo p de un arreglo (N, n, n) de claves."""
+    a = np.asarray(claves) % p
+    a = a.astype(np.int16)  # los valores quedan en 0..p-1 y los productos en int16
+    total, n, _ = a.shape
+    inversos = _INVERSOS_MOD[p]
+    det = np.ones(total, dtype=np.int16)
+    indices = np.arange(total)
+    for col in range(n):
+        no_nulos = a[:, col:, col] != 0
+        piv = no_nulos.argmax(axis=1) + col
+        det[~no_nulos.any(axis=1)] = 0
+        cambio = piv != col
+        det[cambio] = (p - det[cambio]) % p
+        fila_col = a[indices, col].copy()
+        a[indices, col] = a[indices, piv]
+        a[indices, piv] = fila_col
+        pivote = a[:, col, col]
+        det = det * pivote % p
+        # sin pivote el inverso es 0 y la columna se queda como está (det ya es 0)
+        factores = a[:, col + 1:, col] * inversos[pivote][:, None] % p
+        a[:, col + 1:, col:] = (a[:, col + 1:, col:] - factores[:, :, None] * a[:, None, col, col:]) % p
+    return det
+
+def determinantes(claves):
+    """Determinantes módulo 26 de un arreglo (N, n, n) de claves."""
+    return crt_26(determinantes_mod_primo(claves, 2), determinantes_mod_primo(claves, 13))
+
+def claves_validas(claves):
+    """Máscara booleana (N,) de las claves con determinante coprimo con 26."""
+    return _ES_UNIDAD[determinantes(claves)]
+
+def claves_por_indice(inicio, fin, n):
+    """
+    Claves n x n número inicio..fin-1 de las 26^(n*n) posibles, como arreglo
+    (fin - inicio, n, n) de uint8. El índice es la clave leída por filas en base 26.
+    """
+    if n > _MAX_N_ENUMERABLE:
+        raise ValueError(f"Solo se pueden numerar claves hasta {_MAX_N_ENUMERABLE} x {_MAX_N_ENUMERABLE}.")
+    indices = np.arange(inicio, fin, dtype=np.int64)
+    pesos = 26 ** np.arange(n * n - 1, -1, -1, dtype=np.int64)
+    return (indices[:, None] // pesos % 26).astype(np.uint8).reshape(-1, n, n)
+
+def _contar_rango(n, inicio, fin):
+    return int(claves_validas(claves_por_indice(inicio, fin, n)).sum())
+
+def _rangos(inicio, fin, lote):
+    return [(i, min(i + lote, fin)) for i in range(inicio, fin, lote)]
+
+def enumerar_claves_validas(n, inicio=0, fin=None, lote=LOTE):
+    """Genera, por lotes, los arreglos (k, n, n) de claves válidas con índice en [inicio, fin)."""
+    fin = 26 ** (n * n) if fin is None else fin
+    for a, b in _rangos(inicio, fin, lote):
+        claves = claves_por_indice(a, b, n)
+        yield claves[claves_validas(claves)]
+
+def contar_claves_validas(n, inicio=0, fin=None, lote=LOTE, procesos=1):
+    """
+    Cuenta las claves n x n válidas con índice en [inicio, fin). Con procesos > 1
+    los lotes se reparten entre varios procesos.
+    """
+    fin = 26 ** (n * n) if fin is None else fin
+    rangos = _rangos(inicio, fin, lote)
+    if procesos <= 1:
+        return sum(_contar_rango(n, a, b) for a, b in rangos)
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        return sum(pool.map(_contar_rango, [n] * len(rangos), *zip(*rangos)))
+
+# --- FUNCIÓN PRINCIPAL ---
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Análisis del cifrado de Hill.")
+    sub = parser.add_subparsers(dest="accion", required=True)
+
+    rec = sub.add_parser("recuperar", help="Recuperar la clave a partir de texto plano y cifrado conocidos.")
+    rec.add_argument("--plano", "-p", required=True, help="Texto plano conocido.")
+    rec.add_argument("--cifrado", "-c", required=True, help="Cifrado correspondiente.")
+    rec.add_argument("-n", type=int, default=2, help="Dimensión de la clave (por defecto 2).")
+
+    cont = sub.add_parser("contar", help="Contar las claves n x n válidas (n <= 3).")
+    cont.add_argument("-n", type=int, default=2, help="Dimensión de la clave (por defecto 2).")
+    cont.add_argument("--inicio", type=int, default=0, help="Primer índice de clave.")
+    cont.add_argument("--fin", type=int, help="Índice final (excluido); por defecto 26^(n*n).")
+    cont.add_argument("--lote", type=int, default=LOTE, help=f"Claves por lote (por defecto {LOTE}).")
+    cont.add_argument("--procesos", "-j", type=int, default=1, help="Procesos en paralelo (por defecto 1).")
+
+    val = sub.add_parser("validar", help="Comprobar claves escritas como \"a,b;c,d\".")
+    val.add_argument("claves", nargs="+", help="Una o más claves de la misma dimensión.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    try:
+        if args.accion == "recuperar":
+            clave = recuperar_clave(args.plano, args.cifrado, args.n)
+            print("Clave recuperada:", clave.tolist())
+            comprobado = hill_cifrado(args.plano, clave)
+            print("Cifrado con esa clave:", comprobado)
+        elif args.accion == "contar":
+            total = contar_claves_validas(args.n, args.inicio, args.fin, args.lote, args.procesos)
+            print(f"Claves {args.n} x {args.n} válidas: {total}")
+        else:
+            claves = np.stack([leer_clave(c) for c in args.claves])
+            for texto, det, valida in zip(args.claves, determinantes(claves), claves_validas(claves)):
+                print(f"{texto}: determinante {det} -> {'válida' if valida else 'no válida'}")
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
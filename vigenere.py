@@ -1,8 +1,17 @@
 #-------------------------Vigenere cypher-----------------------------------
 import argparse
+import codecs
 import unicodedata
 import sys
 
+import numpy as np
+
+# Letter frequencies and the batched Caesar chi-squared scorer (each Vigenère column is a Caesar cipher)
+from Caesar import FRECUENCIAS, chi2_scores
+# mmap helpers shared with the AES/DES programs (comun/ lives next to this file,
+# so it is importable whenever Caesar.py is)
+from comun import mmap_io
+
 ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
 A2I = {c:i for i,c in enumerate(ALPHABET)}
 I2A = {i:c for i,c in enumerate(ALPHABET)}
@@ -11,9 +20,46 @@ def strip_accents(s: str) -> str:
     # Normalize accents to plain ASCII
     return ''.join(ch for ch in unicodedata.normalize('NFD', s) if unicodedata.category(ch) != 'Mn')
 
+def _normalize_char(ch: str) -> str:
+    # The original pipeline (NFD, drop Mn, upper, keep isalpha) applied to one character
+    s = strip_accents(ch).upper()
+    return ''.join(c for c in s if c.isalpha())
+
+class _NormalizeTable(dict):
+    # str.translate table that fills itself on first sight of each character.
+    # Every step of the pipeline works per character (NFD reordering only moves
+    # combining marks, which are dropped anyway), so mapping each character on
+    # its own gives exactly the same result as normalizing the whole string.
+    def __missing__(self, code: int):
+        value = _normalize_char(chr(code)) or None
+        self[code] = value
+        return value
+
+_NORMALIZE_TABLE = _NormalizeTable()
+
+# ASCII fast path: a-z -> A-Z, every non-letter byte deleted, in one bytes.translate pass
+_ASCII_UPPER = bytes.maketrans(b'abcdefghijklmnopqrstuvwxyz', ALPHABET.encode('ascii'))
+_ASCII_DROP = bytes(b for b in range(128) if not chr(b).isalpha()) + bytes(range(128, 256))
+
+_ASCII_CHARS = frozenset(map(chr, range(128)))
+# Above this many distinct non-ASCII characters one str.translate pass beats a replace() per character
+_MAX_REPLACE_PASSES = 32
+
 def normalize_letters(s: str) -> str:
-    s = strip_accents(s).upper()
-    return ''.join(ch for ch in s if ch.isalpha())
+    if not s.isascii():
+        # Usual case: mostly ASCII with a few accented letters. Each distinct one is
+        # replaced by its (ASCII) mapping, then the ASCII fast path finishes the job.
+        mapped = {ch: _NORMALIZE_TABLE[ord(ch)] or '' for ch in set(s).difference(_ASCII_CHARS)}
+        if len(mapped) > _MAX_REPLACE_PASSES or not all(m.isascii() for m in mapped.values()):
+            return s.translate(_NORMALIZE_TABLE)
+        for ch, m in mapped.items():
+            s = s.replace(ch, m)
+    return s.encode('ascii').translate(_ASCII_UPPER, _ASCII_DROP).decode('ascii')
+
+def normalize_chunks(chunks):
+    # Streaming version: characters are independent, so chunks may be cut anywhere
+    for chunk in chunks:
+        yield normalize_letters(chunk)
 
 def repeat_key(key: str, n: int) -> str:
     if n == 0:
@@ -42,6 +88,194 @@ def vigenere_decrypt(ciphertext: str, key: str) -> str:
         out.append(I2A[p])
     return ''.join(out)
 
+# ---- Vectorized versions (NumPy): same output as the loops above ----
+def letters_to_array(s: str) -> np.ndarray:
+    # s is already normalized (A-Z only): one uint8 array with values 0..25
+    try:
+        data = s.encode('ascii')
+    except UnicodeEncodeError as e:
+        raise KeyError(s[e.start]) from None  # same failure as A2I[...] in the loops
+    return np.frombuffer(data, dtype=np.uint8) - 65
+
+def array_to_letters(a: np.ndarray) -> str:
+    return (a + 65).astype(np.uint8).tobytes().decode('ascii')
+
+def _shift_by_key(text: np.ndarray, key: np.ndarray) -> np.ndarray:
+    # Add the key periodically without building the repeated key: the text is
+    # viewed as rows of len(key) letters and the key is broadcast over them.
+    out = text.astype(np.int16)
+    m = len(key)
+    full = len(out) - len(out) % m
+    out[:full].reshape(-1, m)[...] += key
+    out[full:] += key[:len(out) - full]
+    np.remainder(out, 26, out=out)
+    return out
+
+def _key_array(key: str) -> np.ndarray:
+    key = normalize_letters(key)
+    if not key:
+        raise ValueError("Key must contain at least one alphabetic character.")
+    return letters_to_array(key).astype(np.int16)
+
+def vigenere_encrypt_np(plaintext: str, key: str) -> str:
+    P = letters_to_array(normalize_letters(plaintext))
+    if len(P) == 0:
+        return ''
+    return array_to_letters(_shift_by_key(P, _key_array(key)))
+
+def vigenere_decrypt_np(ciphertext: str, key: str) -> str:
+    C = letters_to_array(normalize_letters(ciphertext))
+    if len(C) == 0:
+        return ''
+    return array_to_letters(_shift_by_key(C, -_key_array(key)))
+
+# ---- Autokey and running-key variants (non-periodic keystreams) ----
+AUTOKEY_BLOCK = 1 << 16   # letters decoded per NumPy step by the autokey decoder
+BOOK_CHUNK = 1 << 20      # bytes of the key book decoded at a time
+
+def _add_keystream(text: np.ndarray, keystream: np.ndarray, sign: int = 1) -> np.ndarray:
+    # Shared core of every variant: text +/- keystream (mod 26), one letter each
+    out = text.astype(np.int16)
+    out += sign * keystream.astype(np.int16)
+    np.remainder(out, 26, out=out)
+    return out
+
+def autokey_encrypt_chunks(chunks, key: str):
+    # Autokey: the keystream is the key followed by the plaintext itself.
+    # Takes chunks of normalized letters; only the last len(key) letters are carried over.
+    prev = _key_array(key)
+    for chunk in chunks:
+        P = letters_to_array(chunk)
+        keystream = np.concatenate((prev, P))
+        yield array_to_letters(_add_keystream(P, keystream[:len(P)]))
+        prev = keystream[len(P):]
+
+def autokey_decrypt_chunks(chunks, key: str):
+    # Decrypting is sequential (P[i] = C[i] - P[i-m]), but splitting the letters in
+    # rows of m = len(key) turns it into an alternating sum down each column:
+    #   P[t] = (-1)^t * (C[0] - C[1] + ... +/- C[t] - prev)
+    # so each block is one cumsum. `prev` (the last m plaintext letters) is the
+    # only state kept between blocks, which may have any length.
+    prev = _key_array(key).astype(np.int64)
+    m = len(prev)
+    for chunk in chunks:
+        C = letters_to_array(chunk)
+        for start in range(0, len(C), AUTOKEY_BLOCK):
+            block = C[start:start + AUTOKEY_BLOCK]
+            rows = -(-len(block) // m)
+            M = np.zeros(rows * m, dtype=np.int64)
+            M[:len(block)] = block
+            sign = np.where(np.arange(rows) % 2, -1, 1)[:, None]
+            P = (sign * (np.cumsum(sign * M.reshape(rows, m), axis=0) - prev) % 26).ravel()[:len(block)]
+            prev = np.concatenate((prev, P))[-m:]
+            yield array_to_letters(P)
+
+def autokey_encrypt(plaintext: str, key: str) -> str:
+    return ''.join(autokey_encrypt_chunks([normalize_letters(plaintext)], key))
+
+def autokey_decrypt(ciphertext: str, key: str) -> str:
+    return ''.join(autokey_decrypt_chunks([normalize_letters(ciphertext)], key))
+
+def running_keystream(book_path: str, n: int, offset: int = 0) -> np.ndarray:
+    # First n letters of the key book from byte `offset` on. The book is memory-mapped
+    # and decoded BOOK_CHUNK bytes at a time, so only the letters needed are ever read.
+    # Letters outside A-Z (e.g. Ø, Greek) are skipped; bytes of a character cut by
+    # `offset` are ignored.
+    out = np.empty(n, dtype=np.uint8)
+    filled = 0
+    decoder = codecs.getincrementaldecoder('utf-8')('ignore')
+    with mmap_io.map_input(book_path) as book:
+        pos = offset
+        while filled < n and pos < len(book):
+            piece = book[pos:pos + BOOK_CHUNK]
+            letters = normalize_letters(decoder.decode(piece)).encode('ascii', 'ignore')
+            piece.release()
+            take = min(len(letters), n - filled)
+            out[filled:filled + take] = np.frombuffer(letters, dtype=np.uint8, count=take)
+            filled += take
+            pos += BOOK_CHUNK
+    if filled < n:
+        raise ValueError(f"Key book has only {filled} letters after offset {offset}; {n} needed.")
+    return out - 65
+
+def running_key_encrypt(plaintext: str, book_path: str, offset: int = 0) -> str:
+    P = letters_to_array(normalize_letters(plaintext))
+    return array_to_letters(_add_keystream(P, running_keystream(book_path, len(P), offset)))
+
+def running_key_decrypt(ciphertext: str, book_path: str, offset: int = 0) -> str:
+    C = letters_to_array(normalize_letters(ciphertext))
+    return array_to_letters(_add_keystream(C, running_keystream(book_path, len(C), offset), -1))
+
+# ---- Cryptanalysis: key length (IoC + Kasiski), then each column as a Caesar problem ----
+IOC_SAMPLE = 400          # letters per column used to estimate the IoC of a period
+KASISKI_SAMPLE = 60000    # letters scanned for repeated trigrams
+RANDOM_IOC = 1 / 26
+IOC_THRESHOLD = 0.7       # share of the language's IoC excess a period needs to be accepted
+MIN_COLUMN = 10           # periods are capped so every column has at least this many letters
+
+def ioc_by_period(C: np.ndarray, max_period: int) -> np.ndarray:
+    # ioc[p] = mean index of coincidence of the p columns, for every p in 1..max_period
+    # at once: each (letter, period, column) gets its own bin in a single bincount.
+    sample = C[:IOC_SAMPLE * max_period].astype(np.intp)
+    periods = np.arange(1, max_period + 1)
+    first = np.concatenate(([0], np.cumsum(periods)[:-1]))    # first column id of each period
+    cols = np.arange(len(sample))[:, None] % periods + first  # (letters, periods)
+    counts = np.bincount((cols * 26 + sample[:, None]).ravel(), minlength=periods.sum() * 26).reshape(-1, 26)
+    n = counts.sum(axis=1)
+    col_ioc = (counts * (counts - 1)).sum(axis=1) / np.maximum(n * (n - 1), 1)
+    ioc = np.zeros(max_period + 1)
+    ioc[1:] = np.add.reduceat(col_ioc, first) / periods
+    return ioc
+
+def kasiski_by_period(C: np.ndarray, max_period: int) -> np.ndarray:
+    # kas[p] = share of distances between repeated trigrams divisible by p, minus the
+    # 1/p expected by chance. Trigrams are hashed to one integer and grouped by sorting.
+    S = C[:KASISKI_SAMPLE].astype(np.int64)
+    kas = np.zeros(max_period + 1)
+    if len(S) < 4 or max_period < 2:
+        return kas
+    h = S[:-2] * 676 + S[1:-1] * 26 + S[2:]
+    order = np.argsort(h, kind='stable')   # stable: positions increase inside each group
+    same = h[order[1:]] == h[order[:-1]]
+    dist = (order[1:] - order[:-1])[same]
+    if len(dist) == 0:
+        return kas
+    periods = np.arange(2, max_period + 1)
+    kas[2:] = (dist[:, None] % periods == 0).mean(axis=0) - 1 / periods
+    return kas
+
+def estimate_key_length(C: np.ndarray, max_period: int, lang: str = 'en') -> int:
+    # The key length is the smallest period whose columns look like the language
+    # (IoC excess over random text at least IOC_THRESHOLD of the language's);
+    # multiples of it qualify too but come later. If no period qualifies (short text,
+    # other language) IoC and Kasiski are rescaled to [0, 1] and the smallest period
+    # close to the best combined score wins.
+    max_period = max(1, min(max_period, len(C) // MIN_COLUMN))
+    ioc = ioc_by_period(C, max_period) - RANDOM_IOC
+    freq = np.asarray(FRECUENCIAS[lang]) / 100
+    ok = np.flatnonzero(ioc[1:] >= IOC_THRESHOLD * ((freq ** 2).sum() - RANDOM_IOC))
+    if len(ok):
+        return int(ok[0] + 1)
+    ioc = np.clip(ioc, 0, None)
+    kas = np.clip(kasiski_by_period(C, max_period), 0, None)
+    score = ioc / max(ioc.max(), 1e-12) + kas / max(kas.max(), 1e-12)
+    return int(np.flatnonzero(score[1:] >= 0.9 * score.max())[0] + 1)
+
+def recover_key(C: np.ndarray, period: int, lang: str = 'en') -> np.ndarray:
+    # One histogram per column, then the 26 shifts of every column scored together
+    counts = np.bincount(np.arange(len(C)) % period * 26 + C, minlength=26 * period).reshape(period, 26)
+    return chi2_scores(counts, lang).argmin(axis=1)
+
+def crack(ciphertext: str, max_period: int = 40, lang: str = 'en'):
+    # Returns (key, plaintext) without knowing the key. Letters that are still not
+    # A-Z after normalization (Ø, Æ, Greek...) cannot be part of the ciphertext: skip them.
+    C = np.frombuffer(normalize_letters(ciphertext).encode('ascii', 'ignore'), dtype=np.uint8) - 65
+    if len(C) < 2:
+        raise ValueError("Ciphertext too short to analyse.")
+    period = estimate_key_length(C, max_period, lang)
+    key = recover_key(C, period, lang)
+    return array_to_letters(key), array_to_letters(_shift_by_key(C, -key.astype(np.int16)))
+
 def chunk_group(s: str, t: int) -> str:
     if t <= 0:
         return s
@@ -52,31 +286,65 @@ def main():
     sub = parser.add_subparsers(dest="cmd", required=True)
 
     common = argparse.ArgumentParser(add_help=False)
-    common.add_argument("--key", "-k", required=True, help="Keyword (letters only; accents/spaces ignored)")
+    common.add_argument("--key", "-k", help="Keyword (letters only; accents/spaces ignored)")
     common.add_argument("--t", "-t", type=int, required=True, help="Block size for formatting (does not affect the cipher)")
     common.add_argument("--text", "-x", required=True, help="Input text (message for encrypt, ciphertext for decrypt)")
+    common.add_argument("--variant", "-v", choices=["periodic", "autokey", "running"], default="periodic",
+                        help="periodic (repeating key, default), autokey (key + plaintext) or running (key book)")
+    common.add_argument("--book", "-b", help="Running key: text file used as keystream (memory-mapped)")
+    common.add_argument("--offset", type=int, default=0, help="Running key: byte offset in the book (default: 0)")
 
     p_enc = sub.add_parser("encrypt", parents=[common], help="Encrypt plaintext")
     p_dec = sub.add_parser("decrypt", parents=[common], help="Decrypt ciphertext")
 
+    p_crack = sub.add_parser("crack", help="Recover the key of a ciphertext (IoC + Kasiski + chi-squared)")
+    source = p_crack.add_mutually_exclusive_group(required=True)
+    source.add_argument("--text", "-x", help="Ciphertext")
+    source.add_argument("--file", "-f", help="File with the ciphertext (UTF-8)")
+    p_crack.add_argument("--t", "-t", type=int, default=5, help="Block size for formatting (default: 5)")
+    p_crack.add_argument("--max-period", "-m", type=int, default=40, help="Longest key length tried (default: 40)")
+    p_crack.add_argument("--lang", "-l", choices=sorted(FRECUENCIAS), default="en", help="Plaintext language (default: en)")
+
     args = parser.parse_args()
+    if args.cmd != "crack":
+        if args.variant == "running" and not args.book:
+            parser.error("--variant running needs --book")
+        if args.variant != "running" and not args.key:
+            parser.error("--key is required")
 
     try:
-        if args.cmd == "encrypt":
-            cipher = vigenere_encrypt(args.text, args.key)
-            print("Mode       : ENCRYPT")
-            print("Key        :", normalize_letters(args.key))
-            print("t (blocks) :", args.t)
-            print("Plaintext  :", chunk_group(normalize_letters(args.text), args.t))
-            print("Ciphertext :", chunk_group(cipher, args.t))
+        if args.cmd == "crack":
+            if args.file:
+                with open(args.file, encoding="utf-8") as f:
+                    args.text = f.read()
+            key, plain = crack(args.text, args.max_period, args.lang)
+            print("Mode       : CRACK")
+            print("Key length :", len(key))
+            print("Key        :", key)
+            print("Plaintext  :", chunk_group(plain, args.t))
         else:
-            plain = vigenere_decrypt(args.text, args.key)
-            print("Mode       : DECRYPT")
-            print("Key        :", normalize_letters(args.key))
+            encrypting = args.cmd == "encrypt"
+            if args.variant == "running":
+                fn = running_key_encrypt if encrypting else running_key_decrypt
+                result = fn(args.text, args.book, args.offset)
+                key_info = f"{args.book} (running key, offset {args.offset})"
+            else:
+                if args.variant == "autokey":
+                    fn = autokey_encrypt if encrypting else autokey_decrypt
+                else:
+                    fn = vigenere_encrypt_np if encrypting else vigenere_decrypt_np
+                result = fn(args.text, args.key)
+                key_info = normalize_letters(args.key) + (" (autokey)" if args.variant == "autokey" else "")
+            print("Mode       :", "ENCRYPT" if encrypting else "DECRYPT")
+            print("Key        :", key_info)
             print("t (blocks) :", args.t)
-            print("Ciphertext :", chunk_group(normalize_letters(args.text), args.t))
-            print("Plaintext  :", chunk_group(plain, args.t))
-    except ValueError as e:
+            if encrypting:
+                print("Plaintext  :", chunk_group(normalize_letters(args.text), args.t))
+                print("Ciphertext :", chunk_group(result, args.t))
+            else:
+                print("Ciphertext :", chunk_group(normalize_letters(args.text), args.t))
+                print("Plaintext  :", chunk_group(result, args.t))
+    except (OSError, ValueError) as e:
         print("Error:", e, file=sys.stderr)
         sys.exit(1)
 